@@ -0,0 +1,93 @@
+"""
+Memory and throughput of the normalize -> dedupe -> sort path at scale.
+
+Compares the old per-article dicts (with PublishedAtSort over ISO strings) with
+`Article` records merged by HeapMergeSort, on N synthetic Guardian + NYT items.
+
+    python -m benchmarks.articles              # 100k articles
+    python -m benchmarks.articles -n 20000
+"""
+from __future__ import annotations
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+from benchmarks.stubs import guardian_payload, nyt_payload
+from newssearch.utils.strategies import CanonUrlDedupe, HeapMergeSort, PublishedAtSort
+from newssearch.utils.validation import normalize_guardian, normalize_nyt
+
+def _payloads(n: int) -> Tuple[dict, dict]:
+    half = n // 2
+    return guardian_payload("apple", 1, half), nyt_payload("apple", 1, n - half)
+
+def legacy_dicts(g: dict, y: dict, n: int) -> List[dict]:
+    # the pre-Article normalizers: one fresh dict per article
+    out = [{
+        "source": "guardian",
+        "title": it.get("webTitle"),
+        "description": ((it.get("fields") or {}).get("trailText") or ""),
+        "url": it.get("webUrl"),
+        "published_at": it.get("webPublicationDate"),
+        "website": "The Guardian",
+    } for it in g["response"]["results"]]
+    out += [{
+        "source": "nytimes",
+        "title": (d.get("headline") or {}).get("main"),
+        "description": (d.get("abstract") or "")[:280],
+        "url": d.get("web_url"),
+        "published_at": d.get("pub_date"),
+        "website": "The New York Times",
+    } for d in y["response"]["docs"][:n]]
+    return out
+
+def dict_path(g: dict, y: dict, n: int) -> List[dict]:
+    return PublishedAtSort(desc=True).sort(CanonUrlDedupe().dedupe(legacy_dicts(g, y, n)))
+
+def article_path(g: dict, y: dict, n: int) -> list:
+    streams = [normalize_guardian(g)["items"], normalize_nyt(y, n)["items"]]
+    return HeapMergeSort(desc=True).merge(streams, CanonUrlDedupe(), n)
+
+def measure_memory(build: Callable[[], list]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    keep = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return current
+
+def measure_time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    g, y = _payloads(args.n)
+    n = args.n
+
+    # memory held by N normalized records (the payloads themselves are excluded)
+    mem_dict = measure_memory(lambda: legacy_dicts(g, y, n))
+    mem_art = measure_memory(lambda: normalize_guardian(g)["items"] + normalize_nyt(y, n)["items"])
+
+    t_dict = measure_time(lambda: dict_path(g, y, n), args.repeat)
+    t_art = measure_time(lambda: article_path(g, y, n), args.repeat)
+
+    print(f"articles={n}")
+    print(f"{'path':<10}{'memory_MB':>12}{'bytes/item':>12}{'time_ms':>10}{'items/s':>12}")
+    for name, mem, t in (("dict", mem_dict, t_dict), ("article", mem_art, t_art)):
+        print(f"{name:<10}{mem / 1e6:>12.1f}{mem / n:>12.0f}{t * 1000:>10.1f}{n / t:>12.0f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
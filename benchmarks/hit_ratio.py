@@ -0,0 +1,76 @@
+"""
+Cache hit-ratio report: raw vs canonical cache keys over a query log.
+
+The log uses the load-test format: one query per line, or JSON lines with
+query/page/page_size/offline/sort and an optional `ts` (epoch seconds). With
+timestamps, entries expire after --ttl seconds like the Redis cache does;
+without them every repeat of a key counts as a hit.
+
+    python -m benchmarks.hit_ratio queries.jsonl
+    python -m benchmarks.hit_ratio queries.jsonl --ttl 300 --stem --stopwords
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from newssearch.utils.query import DEFAULT_STOPWORDS, QueryCanonicalizer
+
+def load_log(path: str) -> List[dict]:
+    out = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.rstrip("\n")
+        if not line.strip():
+            continue
+        out.append(json.loads(line) if line.lstrip().startswith("{") else {"query": line})
+    return out
+
+def _key(query: str, spec: dict) -> str:
+    offline = str(spec.get("offline", "")).strip() == "1"
+    return "{}:{}:{}:{}:{}".format(query, spec.get("page", 1), spec.get("page_size", 10),
+                                   offline, spec.get("sort", "date"))
+
+def raw_key(spec: dict) -> str:
+    # how keys were built before canonicalization: the stripped query as sent
+    return _key(spec["query"].strip(), spec)
+
+def canonical_key(canon: Callable[[str], str]) -> Callable[[dict], str]:
+    return lambda spec: _key(canon(spec["query"]), spec)
+
+def hit_ratio(log: List[dict], key_fn: Callable[[dict], str], ttl: Optional[int]) -> Dict[str, float]:
+    expires: Dict[str, float] = {}
+    hits = 0
+    for i, spec in enumerate(log):
+        now = float(spec.get("ts", i))
+        k = key_fn(spec)
+        exp = expires.get(k)
+        if exp is not None and (ttl is None or "ts" not in spec or now < exp):
+            hits += 1
+        else:
+            expires[k] = now + (ttl or 0)
+    return {"requests": len(log), "hits": hits, "distinct_keys": len(expires),
+            "hit_ratio": round(hits / len(log), 4) if log else 0.0}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("log")
+    ap.add_argument("--ttl", type=int, help="cache TTL in seconds (needs ts in the log)")
+    ap.add_argument("--stem", action="store_true")
+    ap.add_argument("--stopwords", action="store_true")
+    args = ap.parse_args(argv)
+
+    log = load_log(args.log)
+    canon = QueryCanonicalizer(stem=args.stem, stopwords=DEFAULT_STOPWORDS if args.stopwords else None)
+    report = {
+        "raw": hit_ratio(log, raw_key, args.ttl),
+        "canonical": hit_ratio(log, canonical_key(canon), args.ttl),
+    }
+    for name, r in report.items():
+        print(f"{name:<10} requests={r['requests']} distinct={r['distinct_keys']} "
+              f"hits={r['hits']} hit_ratio={r['hit_ratio']:.2%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
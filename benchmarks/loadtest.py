@@ -0,0 +1,305 @@
+"""
+Replayable load test for the /search hot path.
+
+Runs the real `newssearch.app.Handler` on an ephemeral port with the Guardian and
+NYT providers pointed at local stub upstreams (benchmarks/stubs.py), replays a
+query mix per scenario and reports throughput plus p50/p95/p99/p999 latency.
+
+Absolute latencies only mean something on the machine that produced them, so
+there is no checked-in baseline: every passing run is appended to a history file
+tagged with a host fingerprint, and a run is compared with the median of the
+last `--window` runs from the same host. Until `--min-runs` runs exist for the
+host the result is only recorded. Any regression beyond the tolerance, or any
+non-200 response, makes the run exit non-zero (and is not recorded).
+
+    python -m benchmarks.loadtest                       # all scenarios, compare with this host's history
+    python -m benchmarks.loadtest --fake-redis          # no Redis needed (fakeredis)
+    python -m benchmarks.loadtest --query-log q.jsonl   # replay recorded queries
+    python -m benchmarks.loadtest --no-record           # compare only, leave the history alone
+"""
+from __future__ import annotations
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.stubs import StubUpstream, UpstreamProfile
+
+HISTORY_PATH = Path(".benchmarks") / "history.jsonl"
+_GATED = ("p50_ms", "p99_ms", "rps")
+API_KEY = "bench-secret"
+
+DEFAULT_TOPICS = [
+    "apple", "climate change", "election", "football", "inflation", "ukraine",
+    "artificial intelligence", "housing market", "space", "covid", "oil prices",
+    "world cup", "tesla", "interest rates", "wildfires", "olympics",
+]
+
+@dataclass
+class Scenario:
+    name: str
+    profile: UpstreamProfile
+    warm: bool = False           # pre-populate the cache with the whole mix before measuring
+    unique: bool = False         # make every request a distinct cache key (forces misses)
+    concurrency_factor: int = 1
+
+SCENARIOS: Dict[str, Scenario] = {s.name: s for s in [
+    Scenario("cold_cache", UpstreamProfile(latency_ms=40), unique=True),
+    Scenario("warm_cache", UpstreamProfile(latency_ms=40), warm=True),
+    Scenario("upstream_down", UpstreamProfile(latency_ms=5, latency_sigma=0, error_rate=1.0), unique=True),
+    Scenario("overload", UpstreamProfile(latency_ms=120, latency_sigma=0.8, throttle_rate=0.3),
+             unique=True, concurrency_factor=4),
+]}
+
+@dataclass
+class Result:
+    scenario: str
+    requests: int
+    concurrency: int
+    elapsed_s: float
+    latencies_ms: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.elapsed_s if self.elapsed_s else 0.0
+
+    def pct(self, p: float) -> float:
+        xs = sorted(self.latencies_ms)
+        if not xs:
+            return 0.0
+        # nearest-rank percentile
+        k = max(0, min(len(xs) - 1, math.ceil(p / 100.0 * len(xs)) - 1))
+        return xs[k]
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "rps": round(self.rps, 1),
+            "p50_ms": round(self.pct(50), 2),
+            "p95_ms": round(self.pct(95), 2),
+            "p99_ms": round(self.pct(99), 2),
+            "p999_ms": round(self.pct(99.9), 2),
+            "non_200": sum(n for s, n in self.statuses.items() if s != 200),
+        }
+
+def load_query_mix(path: Optional[str], n: int, seed: int) -> List[dict]:
+    """Recorded mix: one query per line, or JSON lines with query/page/page_size/sort."""
+    if path:
+        specs = []
+        for line in Path(path).read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            specs.append(json.loads(line) if line.startswith("{") else {"query": line})
+        return [specs[i % len(specs)] for i in range(n)]
+    # synthetic: Zipf-ish skew over topics, mostly page 1
+    rng = random.Random(seed)
+    weights = [1.0 / (i + 1) for i in range(len(DEFAULT_TOPICS))]
+    out = []
+    for _ in range(n):
+        q = rng.choices(DEFAULT_TOPICS, weights)[0]
+        out.append({"query": q, "page": rng.choices([1, 2, 3], [0.8, 0.15, 0.05])[0], "page_size": 10})
+    return out
+
+def _url(base: str, spec: dict, suffix: str = "") -> str:
+    params = {
+        "query": (spec["query"] + suffix).strip(),
+        "page": spec.get("page", 1),
+        "page_size": spec.get("page_size", 10),
+        "sort": spec.get("sort", "date"),
+    }
+    return f"{base}/search?" + urllib.parse.urlencode(params)
+
+def _get(url: str) -> int:
+    req = urllib.request.Request(url, headers={"Authorization": f"Bearer {API_KEY}"})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as r:
+            r.read()
+            return r.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except Exception:
+        return 0
+
+def run_scenario(base: str, sc: Scenario, mix: List[dict], concurrency: int, run_id: str) -> Result:
+    from newssearch.utils.circuit_breaker import guardian_breaker, nyt_breaker
+    guardian_breaker.close()
+    nyt_breaker.close()
+
+    urls = [_url(base, spec, f" {run_id}{i}" if sc.unique else "") for i, spec in enumerate(mix)]
+    if sc.warm:
+        for u in dict.fromkeys(urls):
+            _get(u)
+
+    conc = concurrency * sc.concurrency_factor
+    res = Result(sc.name, len(urls), conc, 0.0)
+    lock = threading.Lock()
+
+    def one(u: str):
+        t0 = time.perf_counter()
+        status = _get(u)
+        dt = (time.perf_counter() - t0) * 1000.0
+        with lock:
+            res.latencies_ms.append(dt)
+            res.statuses[status] = res.statuses.get(status, 0) + 1
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=conc) as pool:
+        list(pool.map(one, urls))
+    res.elapsed_s = time.perf_counter() - t0
+    return res
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Failures for `results` against the rolling `baseline`. Every scenario expects
+    200s (upstream_down is served from the offline fallback), so non-200s fail the
+    run even before a baseline exists: fast 401s/500s would otherwise look like a speedup.
+    """
+    failures = []
+    for name, cur in results.items():
+        if cur.get("non_200"):
+            failures.append(f"{name}: {cur['non_200']} of {cur['requests']} responses were not 200")
+        ref = baseline.get(name)
+        if not ref:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            if ref.get(metric) and cur[metric] > ref[metric] * (1 + tolerance):
+                failures.append(f"{name}: {metric} {cur[metric]} > median {ref[metric]} (+{tolerance:.0%})")
+        if ref.get("rps") and cur["rps"] < ref["rps"] * (1 - tolerance):
+            failures.append(f"{name}: rps {cur['rps']} < median {ref['rps']} (-{tolerance:.0%})")
+    return failures
+
+def host_fingerprint() -> str:
+    """Runs are only comparable on the same hardware and interpreter."""
+    return f"{platform.node()}/{platform.machine()}/{os.cpu_count()}cpu/py{platform.python_version()}"
+
+def load_history(path: Path, host: str) -> List[Dict[str, dict]]:
+    if not path.exists():
+        return []
+    runs = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            entry = json.loads(line)
+            if entry.get("host") == host:
+                runs.append(entry["results"])
+    return runs
+
+def rolling_baseline(runs: List[Dict[str, dict]], window: int) -> Dict[str, dict]:
+    """Per scenario and metric, the median of the last `window` runs that include it."""
+    out: Dict[str, dict] = {}
+    for name in {n for r in runs for n in r}:
+        recent = [r[name] for r in runs if name in r][-window:]
+        out[name] = {m: statistics.median(x[m] for x in recent) for m in _GATED}
+        out[name]["runs"] = len(recent)
+    return out
+
+def append_history(path: Path, host: str, results: Dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"host": host, "at": int(time.time()), "results": results}) + "\n")
+
+def _boot_app(guardian: StubUpstream, nyt: StubUpstream, fake_redis: bool):
+    # config reads the environment at import time, so this must precede any newssearch import
+    settings = {
+        "API_SECRET_KEY": API_KEY,
+        "GUARDIAN_API_KEY": "bench", "NYT_API_KEY": "bench",
+        "GUARDIAN_API_URL": guardian.url, "NYT_API_URL": nyt.url,
+        "OFFLINE_DEFAULT": "0",
+        "NEWS_PROVIDERS": "guardian,nyt",
+        "INGRESS_RATE_LIMIT": "1000000000",
+    }
+    os.environ.update(settings, LOG_LEVEL=os.environ.get("LOG_LEVEL", "CRITICAL"))
+    if fake_redis:
+        import redis
+        import fakeredis
+        redis.StrictRedis = fakeredis.FakeStrictRedis
+    import newssearch.app as app
+    # the project .env is loaded with override=True and silently wins over the values above
+    overridden = [k for k, v in settings.items() if os.environ.get(k) != v]
+    if app.API_SECRET_KEY != API_KEY and "API_SECRET_KEY" not in overridden:
+        overridden.append("API_SECRET_KEY")  # config was imported before the environment was set
+    if overridden:
+        raise SystemExit(f"benchmark settings overridden (check .env): {', '.join(overridden)}")
+    httpd = app.Server(("127.0.0.1", 0), app.Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    host, port = httpd.server_address[:2]
+    return httpd, f"http://{host}:{port}"
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of scenarios")
+    ap.add_argument("--requests", type=int, default=400, help="requests per scenario")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--query-log", help="recorded query mix (plain lines or JSON lines)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--fake-redis", action="store_true", help="use fakeredis instead of REDIS_HOST")
+    ap.add_argument("--history", default=os.environ.get("BENCH_HISTORY", str(HISTORY_PATH)),
+                    help="JSON lines of previous runs (kept on the runner, not in git)")
+    ap.add_argument("--window", type=int, default=5, help="previous runs the median is taken over")
+    ap.add_argument("--min-runs", type=int, default=3, help="runs needed on this host before gating")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed regression fraction")
+    ap.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    ap.add_argument("--out", help="write results JSON here")
+    args = ap.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        ap.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    guardian = StubUpstream("guardian", UpstreamProfile(), seed=args.seed).start()
+    nyt = StubUpstream("nyt", UpstreamProfile(), seed=args.seed + 1).start()
+    httpd, base = _boot_app(guardian, nyt, args.fake_redis)
+
+    mix = load_query_mix(args.query_log, args.requests, args.seed)
+    run_id = f"r{int(time.time())}"
+    results: Dict[str, dict] = {}
+    try:
+        print(f"{'scenario':<15}{'req':>6}{'conc':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'p999':>9}{'non200':>8}")
+        for name in names:
+            sc = SCENARIOS[name]
+            guardian.set_profile(sc.profile)
+            nyt.set_profile(sc.profile)
+            s = run_scenario(base, sc, mix, args.concurrency, f"{run_id}{name}").summary()
+            results[name] = s
+            print(f"{name:<15}{s['requests']:>6}{s['concurrency']:>6}{s['rps']:>9}{s['p50_ms']:>9}"
+                  f"{s['p95_ms']:>9}{s['p99_ms']:>9}{s['p999_ms']:>9}{s['non_200']:>8}")
+    finally:
+        httpd.shutdown()
+        guardian.stop()
+        nyt.stop()
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    history_path = Path(args.history)
+    host = host_fingerprint()
+    baseline = {name: ref for name, ref in rolling_baseline(load_history(history_path, host), args.window).items()
+                if ref["runs"] >= args.min_runs}
+    failures = compare(results, baseline, args.tolerance)
+    for f in failures:
+        print(f"REGRESSION {f}")
+    missing = [n for n in results if n not in baseline]
+    if missing:
+        print(f"not gated (fewer than {args.min_runs} runs on {host}): {', '.join(missing)}")
+    if not failures and not args.no_record:
+        append_history(history_path, host, results)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Local stand-ins for the Guardian and NYT search APIs.
+
+Each stub answers with provider-shaped JSON generated from the query/page, after
+sleeping for a latency drawn from a configurable distribution. A fraction of
+requests can fail with 500 or 429 so breaker/retry/fallback paths get exercised.
+"""
+from __future__ import annotations
+import json
+import random
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+_BASE_TS = datetime(2025, 8, 8, 12, tzinfo=timezone.utc)
+
+@dataclass
+class UpstreamProfile:
+    latency_ms: float = 40.0        # median latency
+    latency_sigma: float = 0.5      # lognormal shape; 0 => fixed latency
+    error_rate: float = 0.0         # fraction answered with 500
+    throttle_rate: float = 0.0      # fraction answered with 429
+    page_size: int = 10
+
+    def sample_latency(self, rng: random.Random) -> float:
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000.0
+        return rng.lognormvariate(0, self.latency_sigma) * self.latency_ms / 1000.0
+
+def _articles(query: str, page: int, n: int, host: str):
+    for i in range(n):
+        idx = (page - 1) * n + i
+        ts = _BASE_TS - timedelta(minutes=7 * idx + len(host))
+        yield idx, ts, f"https://www.{host}/{urllib.parse.quote(query)}/{idx}"
+
+def guardian_payload(query: str, page: int, n: int) -> dict:
+    results = [{
+        "webTitle": f"{query} story {idx}",
+        "webUrl": url,
+        "webPublicationDate": ts.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "fields": {"trailText": f"Guardian coverage of {query} #{idx}"},
+    } for idx, ts, url in _articles(query, page, n, "theguardian.com")]
+    return {"response": {"status": "ok", "total": 500, "results": results}}
+
+def nyt_payload(query: str, page: int, n: int) -> dict:
+    docs = [{
+        "headline": {"main": f"{query} report {idx}"},
+        "web_url": url,
+        "pub_date": ts.strftime("%Y-%m-%dT%H:%M:%S+0000"),
+        "abstract": f"NYT abstract on {query} #{idx}",
+    } for idx, ts, url in _articles(query, page, n, "nytimes.com")]
+    return {"response": {"docs": docs, "meta": {"hits": 500}}}
+
+def _handler_for(kind: str, profile: UpstreamProfile, seed: int):
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            pass
+
+        def do_GET(self):
+            qs = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            query = qs.get("q", [""])[0]
+            with rng_lock:
+                delay = profile.sample_latency(rng)
+                roll = rng.random()
+            time.sleep(delay)
+
+            if roll < profile.error_rate:
+                status, payload = 500, {"message": "stub upstream error"}
+            elif roll < profile.error_rate + profile.throttle_rate:
+                status, payload = 429, {"message": "stub rate limited"}
+            elif kind == "guardian":
+                status, payload = 200, guardian_payload(query, int(qs.get("page", ["1"])[0]), profile.page_size)
+            else:
+                # NYT pages are 0-based
+                status, payload = 200, nyt_payload(query, int(qs.get("page", ["0"])[0]) + 1, profile.page_size)
+
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return StubHandler
+
+class _StubServer(ThreadingHTTPServer):
+    request_queue_size = 128
+    daemon_threads = True
+
+class StubUpstream:
+    """A stub provider API on 127.0.0.1:<ephemeral port>; `profile` can be swapped between scenarios."""
+    def __init__(self, kind: str, profile: UpstreamProfile, seed: int = 7):
+        self.kind = kind
+        self._seed = seed
+        self._httpd = _StubServer(("127.0.0.1", 0), _handler_for(kind, profile, seed))
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._httpd.server_address[:2]
+
+    @property
+    def url(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}/search"
+
+    def set_profile(self, profile: UpstreamProfile) -> None:
+        self._httpd.RequestHandlerClass = _handler_for(self.kind, profile, self._seed)
+
+    def start(self) -> "StubUpstream":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -1,20 +1,29 @@
 import os
+import hmac
 import json
 import time
 import urllib.parse
 import mimetypes
 import re
-import redis
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
 from newssearch.config import (
-    HOST, PORT, OFFLINE_DEFAULT, UI_DIR, API_SECRET_KEY, ALLOWED_ORIGIN,
-    REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_CACHE_TTL,
+    HOST, PORT, OFFLINE_DEFAULT, UI_DIR, API_SECRET_KEY, CURSOR_SECRET, ALLOWED_ORIGIN, DEBUG_ENDPOINTS, DEBUG_TOKEN,
+    REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_NODES, REDIS_CACHE_TTL, NEWS_PROVIDERS, INGRESS_RATE_LIMIT,
+    PROVIDER_CACHE_TTLS, NEGATIVE_CACHE_TTL, QUERY_STEMMING, QUERY_STOPWORDS,
+    REDIS_ASYNC_WRITES, REDIS_WRITE_QUEUE, PROVIDER_CONCURRENCY, OFFSET_MAX_PAGES, CURSOR_MAX_WALK_PAGES, BATCH_MAX_QUERIES,
+    SUGGEST_HALF_LIFE_HOURS, SUGGEST_MAX_PHRASES, BUSY_RETRY_AFTER,
 )
-from newssearch.providers.guardian import GuardianProvider
-from newssearch.providers.nyt import NYTProvider
-from newssearch.utils.cache import RedisCache
-from newssearch.utils.strategies import CanonUrlDedupe, PublishedAtSort
-from newssearch.services.aggregator import Aggregator
+from newssearch.providers.registry import build_providers
+from newssearch.utils.cache import RedisCache, BackgroundWriter, CacheBusy
+from newssearch.utils.article import to_json
+from newssearch.utils.cursor import InvalidCursor, encode_cursor, decode_cursor
+from newssearch.utils import profiling
+from newssearch.utils.suggest import SuggestIndex
+from newssearch.utils.redis_client import redis_client
+from newssearch.utils.strategies import CanonUrlDedupe, HeapMergeSort, RelevanceSort
+from newssearch.services.aggregator import Aggregator, SearchSpec
+from newssearch.utils.query import QueryCanonicalizer, DEFAULT_STOPWORDS
 from newssearch.utils.logging_setup import configure_logging_from_env
 from newssearch.utils.rate_limit import RateLimiter  # <-- added
 
@@ -23,40 +32,169 @@ logger = configure_logging_from_env(__name__)
 def clamp(n, lo, hi): return max(lo, min(hi, n))
 def now_ms(): return int(time.time() * 1000)
 
+# ----- shared Redis (one bounded pool per node for cache + limiter + background writes) -----
+REDIS = redis_client(REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_NODES)
+CACHE = RedisCache(
+    REDIS_HOST, REDIS_PORT, REDIS_DB, client=REDIS,
+    writer=BackgroundWriter(REDIS, max_queue=REDIS_WRITE_QUEUE) if REDIS_ASYNC_WRITES else None,
+)
+
 # ----- ingress rate limiter (Redis-backed) -----
-# 60 requests per minute per API key (fallback to client IP)
-_redis_rl = redis.StrictRedis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, decode_responses=True)  # <-- added
-INGRESS_LIMITER = RateLimiter(_redis_rl, "ingress", rate=60, per_seconds=60)  # <-- added
+# INGRESS_RATE_LIMIT (default 60) requests per minute per API key (fallback to client IP)
+INGRESS_LIMITER = RateLimiter(REDIS, "ingress", rate=INGRESS_RATE_LIMIT, per_seconds=60)
 
-def bootstrap():
-    cache = RedisCache(REDIS_HOST, REDIS_PORT, REDIS_DB)
-    providers = [GuardianProvider(), NYTProvider()]
+def bootstrap(cache: RedisCache = CACHE):
+    providers = build_providers(NEWS_PROVIDERS)
     dedupe = CanonUrlDedupe()
-    sorter = PublishedAtSort(desc=True)
-    return Aggregator(providers, cache, dedupe, sorter, REDIS_CACHE_TTL)
+    sorter = HeapMergeSort(desc=True)
+    rankers = {"relevance": RelevanceSort()}
+    return Aggregator(providers, cache, dedupe, sorter, REDIS_CACHE_TTL, rankers,
+                      provider_ttls=PROVIDER_CACHE_TTLS, negative_ttl=NEGATIVE_CACHE_TTL,
+                      provider_concurrency=PROVIDER_CONCURRENCY,
+                      max_offset_pages=OFFSET_MAX_PAGES, max_walk_pages=CURSOR_MAX_WALK_PAGES)
 
 AGGREGATOR = bootstrap()  # single instance; thread-safe as used
+# type-ahead index, fed by the request stream and the titles of fetched articles
+CANONICALIZE = QueryCanonicalizer(stem=QUERY_STEMMING, stopwords=DEFAULT_STOPWORDS if QUERY_STOPWORDS else None)
+SUGGEST = SuggestIndex(half_life_seconds=SUGGEST_HALF_LIFE_HOURS * 3600, max_phrases=SUGGEST_MAX_PHRASES,
+                       cache_ttl=REDIS_CACHE_TTL, canonicalize=CANONICALIZE)
+
+def parse_search(get) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Validate one search spec; `get(name, default)` reads a raw parameter from the
+    query string or a /search/batch entry. Returns (params, None) or (None, error).
+    """
+    query = (get("query", "") or "").strip()
+    if not re.match(r'^[\w\s-]{1,100}$', query):
+        return None, "invalid_query"
+    if not query:
+        return None, "query_required"
+    try:
+        page = int(get("page", "1"))
+    except Exception:
+        page = 1
+    try:
+        page_size = int(get("page_size", "10"))
+    except Exception:
+        page_size = 10
+    city = (get("city", "") or "")[:100]
+    offline_param = (get("offline", "") or "").strip()
+    offline = OFFLINE_DEFAULT or (offline_param == "1")
+    sort = (get("sort", "date") or "").strip().lower() or "date"
+    if sort not in ("date", "relevance"):
+        return None, "invalid_sort"
+
+    page = clamp(page, 1, 1000)
+    page_size = clamp(page_size, 1, 50)
+
+    # equivalent spellings share one cache entry; stemming/stopwords only fold the key,
+    # providers get the user's own terms
+    upstream = CANONICALIZE.upstream(query)
+
+    # ---- keyset pagination: date-ordered walks start at page 1 and continue by cursor ----
+    cursor = (get("cursor", "") or "").strip()
+    state = None
+    if cursor:
+        try:
+            state = decode_cursor(cursor, CURSOR_SECRET)
+        except InvalidCursor:
+            return None, "invalid_cursor"
+        if sort != "date" or state.get("q") != upstream or state.get("ps") != page_size \
+                or state.get("off") != offline:
+            return None, "invalid_cursor"
+        page = clamp(int(state.get("n") or 1), 1, 1000)
+    keyset = sort == "date" and (state is not None or page == 1)
+
+    spec = SearchSpec(upstream, 0 if keyset else page, page_size, offline, sort,
+                      cursor, (state or {}).get("pos"), keyset, CANONICALIZE(query))
+    return {"query": query, "page": page, "page_size": page_size, "city": city,
+            "sort": sort, "cursor": cursor, "spec": spec}, None
+
+def search_response(params: dict, agg: dict, time_taken: int) -> dict:
+    query, page, page_size, sort, spec = (params[k] for k in ("query", "page", "page_size", "sort", "spec"))
+    base = "/search?query={}&page_size={}&city={}&sort={}".format(
+        urllib.parse.quote(query), page_size, urllib.parse.quote(params["city"]), sort
+    )
+    next_cursor = None
+    if spec.keyset:
+        if agg.get("next"):
+            next_cursor = encode_cursor(
+                {"q": spec.query, "ps": page_size, "off": spec.offline, "n": page + 1, "pos": agg["next"]},
+                CURSOR_SECRET,
+            )
+        links = {
+            "self": f"{base}&cursor={spec.cursor}" if spec.cursor else f"{base}&page=1",
+            "next": f"{base}&cursor={next_cursor}" if next_cursor else None,
+            "prev": None,
+        }
+    else:
+        next_page = page + 1 if page < agg["total_estimated_pages"] else None
+        prev_page = page - 1 if page > 1 else None
+        links = {
+            "self": f"{base}&page={page}",
+            "next": f"{base}&page={next_page}" if next_page else None,
+            "prev": f"{base}&page={prev_page}" if prev_page else None
+        }
+    out = {
+        "keyword": query,
+        "city": params["city"],
+        "page": page,
+        "page_size": page_size,
+        "sort": sort,
+        "total_estimated_pages": agg["total_estimated_pages"],
+        "time_taken_ms": time_taken,
+        "next_cursor": next_cursor,
+        "links": links,
+        "items": agg["items"]
+    }
+    if agg.get("partial"):
+        out["partial"] = True  # cut short by CURSOR_MAX_WALK_PAGES; next_cursor continues
+    return out
+
+def record_suggestions(query: str, items=None) -> None:
+    """Feed /suggest from a search that was already answered; failures are only logged."""
+    try:
+        SUGGEST.record_query(query)
+        if items is not None:
+            SUGGEST.record_titles(it.get("title") for it in items)
+    except Exception as e:
+        logger.error("suggest_record_fail query=%r err=%s", query, e, exc_info=True)
+
+class Server(ThreadingHTTPServer):
+    # the stdlib default listen backlog of 5 drops SYNs under bursts (1s client retransmit)
+    request_queue_size = 128
+    daemon_threads = True
 
 class Handler(BaseHTTPRequestHandler):
     def log_message(self, fmt, *args):
         pass  # suppress default stdout access logs
 
-    def _send_json(self, status: int, payload: dict):
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None):
         try:
-            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-            origin = self.headers.get("Origin", "")
-            allow_origin = origin if re.match(r"^http://localhost:\d+$", origin) else ALLOWED_ORIGIN
-            self.send_response(status)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Access-Control-Allow-Origin", allow_origin)
-            self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type")
-            self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
+            body = json.dumps(payload, ensure_ascii=False, default=to_json).encode("utf-8")
+            self._send_head(status, "application/json; charset=utf-8", len(body), headers)
             self.wfile.write(body)
         except Exception as e:
             logger.error("http_send_fail status=%d err=%s", status, e, exc_info=True)
 
+    def _send_head(self, status: int, ctype: str, length: Optional[int] = None, headers: Optional[dict] = None):
+        origin = self.headers.get("Origin", "")
+        allow_origin = origin if re.match(r"^http://localhost:\d+$", origin) else ALLOWED_ORIGIN
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Access-Control-Allow-Origin", allow_origin)
+        self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        if length is not None:
+            self.send_header("Content-Length", str(length))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _send_busy(self):
+        # Redis pool saturated: retryable overload, not the client's rate limit
+        return self._send_json(503, {"error": "cache_unavailable"}, {"Retry-After": str(BUSY_RETRY_AFTER)})
+
     def do_OPTIONS(self):
         try:
             origin = self.headers.get("Origin", "")
@@ -64,7 +202,7 @@ class Handler(BaseHTTPRequestHandler):
             self.send_response(204)
             self.send_header("Access-Control-Allow-Origin", allow_origin)
             self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type")
-            self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
+            self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
             self.end_headers()
         except Exception as e:
             logger.error("http_options_fail err=%s", e, exc_info=True)
@@ -73,7 +211,7 @@ class Handler(BaseHTTPRequestHandler):
         parsed = urllib.parse.urlparse(self.path)
 
         try:
-            if parsed.path.startswith("/search") or parsed.path == "/openapi.json":
+            if parsed.path.startswith(("/search", "/suggest")) or parsed.path == "/openapi.json":
                 auth = self.headers.get("Authorization", "")
                 if not auth or auth != f"Bearer {API_SECRET_KEY}":
                     return self._send_json(401, {"error": "unauthorized"})
@@ -94,6 +232,12 @@ class Handler(BaseHTTPRequestHandler):
             if parsed.path == "/health":
                 return self._send_json(200, {"status": "ok"})
 
+            if parsed.path.startswith("/debug/"):
+                return self._debug(parsed)
+
+            if parsed.path == "/suggest":
+                return self._suggest(parsed)
+
             if parsed.path == "/openapi.json":
                 try:
                     with open("../openapi.json", "rb") as f:
@@ -110,76 +254,198 @@ class Handler(BaseHTTPRequestHandler):
                     return self._send_json(500, {"error": "openapi_serve_error"})
 
             if parsed.path == "/search":
-                # ---- ingress rate-limit check (per API key/IP) ----
-                identity = self.headers.get("Authorization") or self.client_address[0]  # <-- added
-                if not INGRESS_LIMITER.allow(identity):  # <-- added
-                    return self._send_json(429, {"error": "rate_limit_exceeded"})  # <-- added
-
                 qs = urllib.parse.parse_qs(parsed.query or "")
-                query = (qs.get("query", [""])[0]).strip()
-                if not re.match(r'^[\w\s-]{1,100}$', query):
-                    return self._send_json(400, {"error": "invalid_query"})
-                if not query:
-                    return self._send_json(400, {"error": "query_required"})
-                try:
-                    page = int(qs.get("page", ["1"])[0])
-                except Exception:
-                    page = 1
-                try:
-                    page_size = int(qs.get("page_size", ["10"])[0])
-                except Exception:
-                    page_size = 10
-                city = (qs.get("city", [""])[0])[:100]
-                offline_param = (qs.get("offline", [""])[0]).strip()
-                offline = OFFLINE_DEFAULT or (offline_param == "1")
-
-                page = clamp(page, 1, 1000)
-                page_size = clamp(page_size, 1, 50)
+                params, error = parse_search(lambda name, default: qs.get(name, [default])[0])
+                if error:
+                    return self._send_json(400, {"error": error})
+                spec = params["spec"]
 
+                # ---- ingress rate-limit check (per API key/IP) + cache read, one round trip ----
                 start_ms = now_ms()
+                identity = self.headers.get("Authorization") or self.client_address[0]
                 try:
-                    agg = AGGREGATOR.aggregate(query, page, page_size, offline)
-                    time_taken = now_ms() - start_ms
-                    base = "/search?query={}&page_size={}&city={}".format(
-                        urllib.parse.quote(query), page_size, urllib.parse.quote(city)
-                    )
-                    next_page = page + 1 if page < agg["total_estimated_pages"] else None
-                    prev_page = page - 1 if page > 1 else None
-                    return self._send_json(200, {
-                        "keyword": query,
-                        "city": city,
-                        "page": page,
-                        "page_size": page_size,
-                        "total_estimated_pages": agg["total_estimated_pages"],
-                        "time_taken_ms": time_taken,
-                        "links": {
-                            "self": f"{base}&page={page}",
-                            "next": f"{base}&page={next_page}" if next_page else None,
-                            "prev": f"{base}&page={prev_page}" if prev_page else None
-                        },
-                        "items": agg["items"]
-                    })
+                    allowed, cached = CACHE.get_json_rate_limited(INGRESS_LIMITER, identity, spec.key)
+                except CacheBusy:
+                    return self._send_busy()
+                if not allowed:
+                    return self._send_json(429, {"error": "rate_limit_exceeded"})
+
+                try:
+                    if cached:
+                        agg = cached
+                    else:
+                        agg = AGGREGATOR.aggregate_spec(spec, check_cache=False)
+                    self._send_json(200, search_response(params, agg, now_ms() - start_ms))
                 except Exception as e:
+                    query, page, page_size, city, sort = (params[k] for k in ("query", "page", "page_size", "city", "sort"))
                     logger.error("search_fail query=%r err=%s", query, e, exc_info=True)
-                    agg = AGGREGATOR.aggregate(query, page, page_size, True)
+                    agg = AGGREGATOR.aggregate(spec.query, page, page_size, True, sort)
                     time_taken = now_ms() - start_ms
                     return self._send_json(200, {
                         "keyword": query, "city": city,
-                        "page": page, "page_size": page_size,
+                        "page": page, "page_size": page_size, "sort": sort,
                         "total_estimated_pages": agg["total_estimated_pages"],
                         "time_taken_ms": time_taken,
                         "offline": True,
                         "links": {
-                            "self": f"/search?query={urllib.parse.quote(query)}&page={page}&page_size={page_size}&city={urllib.parse.quote(city)}"
+                            "self": f"/search?query={urllib.parse.quote(query)}&page={page}&page_size={page_size}&city={urllib.parse.quote(city)}&sort={sort}"
                         },
                         "items": agg["items"]
                     })
+                # after the response is out and outside the try: an index error must not send a second one
+                record_suggestions(params["query"], None if cached else agg["items"])
+                return
 
             return self._serve_static(parsed.path)
         except Exception as e:
             logger.error("request_unhandled_error path=%s err=%s", parsed.path, e, exc_info=True)
             return self._send_json(500, {"error": "internal_error"})
 
+    def _suggest(self, parsed):
+        t0 = time.perf_counter()
+        qs = urllib.parse.parse_qs(parsed.query or "")
+        prefix = (qs.get("prefix", [""])[0]).strip()
+        if not re.match(r'^[\w\s-]{1,100}$', prefix):
+            return self._send_json(400, {"error": "invalid_prefix"})
+        try:
+            limit = clamp(int(qs.get("limit", ["8"])[0]), 1, 20)
+        except ValueError:
+            limit = 8
+        found = SUGGEST.suggest(prefix, limit)
+        return self._send_json(200, {
+            "prefix": prefix,
+            "suggestions": [{"query": p, "score": score, "cached": cached} for p, score, cached in found],
+            "time_taken_us": int((time.perf_counter() - t0) * 1e6),
+        })
+
+    def _debug(self, parsed):
+        if not (DEBUG_ENDPOINTS and DEBUG_TOKEN):
+            return self._send_json(404, {"error": "not_found"})
+        auth = self.headers.get("Authorization", "")
+        if not hmac.compare_digest(auth.encode("utf-8"), f"Bearer {DEBUG_TOKEN}".encode("utf-8")):
+            return self._send_json(401, {"error": "unauthorized"})
+        qs = urllib.parse.parse_qs(parsed.query or "")
+
+        if parsed.path == "/debug/threads":
+            return self._send_json(200, {"threads": profiling.thread_stacks()})
+        if parsed.path not in ("/debug/profile", "/debug/alloc"):
+            return self._send_json(404, {"error": "not_found"})
+        try:
+            seconds = clamp(float(qs.get("seconds", ["10"])[0]), 0.1, 60)
+        except ValueError:
+            return self._send_json(400, {"error": "invalid_seconds"})
+        try:
+            if parsed.path == "/debug/profile":
+                try:
+                    hz = clamp(int(qs.get("hz", ["100"])[0]), 1, 1000)
+                except ValueError:
+                    hz = 100
+                counts = profiling.sample_stacks(seconds, hz)
+                logger.info("debug_profile seconds=%s hz=%d samples=%d", seconds, hz, sum(counts.values()))
+                if qs.get("format", ["collapsed"])[0] == "json":
+                    return self._send_json(200, {"seconds": seconds, "hz": hz, "stacks": dict(counts.most_common())})
+                body = profiling.render_collapsed(counts).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Disposition", 'attachment; filename="profile.folded"')
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                return self.wfile.write(body)
+            try:
+                limit = clamp(int(qs.get("limit", ["25"])[0]), 1, 500)
+            except ValueError:
+                limit = 25
+            return self._send_json(200, profiling.top_allocations(seconds, limit))
+        except profiling.ProfilerBusy as e:
+            return self._send_json(409, {"error": "profiler_busy", "detail": str(e)})
+
+    def do_POST(self):
+        parsed = urllib.parse.urlparse(self.path)
+        try:
+            if parsed.path != "/search/batch":
+                return self._send_json(404, {"error": "not_found"})
+            auth = self.headers.get("Authorization", "")
+            if not auth or auth != f"Bearer {API_SECRET_KEY}":
+                return self._send_json(401, {"error": "unauthorized"})
+            return self._search_batch()
+        except Exception as e:
+            logger.error("request_unhandled_error path=%s err=%s", parsed.path, e, exc_info=True)
+            return self._send_json(500, {"error": "internal_error"})
+
+    def _search_batch(self):
+        """
+        POST /search/batch {"queries": [{query, page, page_size, offline, sort, cursor, city}, ...],
+        "stream": false}. One rate-limit + MGET round trip for every page, one MGET for
+        the provider entries behind the misses, then a concurrent fan-out. Entries match
+        the /search response plus "index"; invalid entries carry {"index", "error"}.
+        With "stream": true, entries are written as NDJSON lines in completion order.
+        """
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) if 0 < length <= 65536 else b"")
+            specs = body["queries"]
+            stream = bool(body.get("stream"))
+        except Exception:
+            return self._send_json(400, {"error": "invalid_batch"})
+        if not isinstance(specs, list) or not specs or len(specs) > BATCH_MAX_QUERIES:
+            return self._send_json(400, {"error": "invalid_batch"})
+
+        def reader(entry):
+            entry = entry if isinstance(entry, dict) else {}
+            def get(name, default):
+                value = entry.get(name)
+                if value is None:  # absent or JSON null
+                    return default
+                return str(int(value)) if isinstance(value, bool) else str(value)
+            return get
+
+        start_ms = now_ms()
+        parsed = [parse_search(reader(e)) for e in specs]
+        valid = [i for i, (params, _) in enumerate(parsed) if params]
+        identity = self.headers.get("Authorization") or self.client_address[0]
+        keys = [parsed[i][0]["spec"].key for i in valid]
+        try:
+            allowed, cached = CACHE.get_many_json_rate_limited(INGRESS_LIMITER, identity, keys, cost=len(specs))
+        except CacheBusy:
+            return self._send_busy()
+        if not allowed:
+            return self._send_json(429, {"error": "rate_limit_exceeded"})
+
+        def entry(i, agg):
+            if agg is None:
+                return {"index": i, "error": parsed[i][1] or "search_failed"}
+            return {"index": i, **search_response(parsed[i][0], agg, now_ms() - start_ms)}
+
+        ready = [entry(i, None) for i, (params, _) in enumerate(parsed) if not params]
+        ready += [entry(i, agg) for i, agg in zip(valid, cached) if agg]
+        misses = [i for i, agg in zip(valid, cached) if not agg]
+        results = AGGREGATOR.aggregate_many([parsed[i][0]["spec"] for i in misses])
+        served = [(i, None) for i, agg in zip(valid, cached) if agg]  # (index, fresh items to index)
+
+        if not stream:
+            out = list(ready)
+            for j, agg in results:
+                out.append(entry(misses[j], agg))
+                if agg:
+                    served.append((misses[j], agg["items"]))
+            out.sort(key=lambda e: e["index"])
+            self._send_json(200, {"results": out, "time_taken_ms": now_ms() - start_ms})
+        else:
+            # HTTP/1.0 response without Content-Length: the body ends when the connection closes
+            self._send_head(200, "application/x-ndjson; charset=utf-8")
+            for e in ready:
+                self._write_line(e)
+            for j, agg in results:
+                self._write_line(entry(misses[j], agg))
+                if agg:
+                    served.append((misses[j], agg["items"]))
+        for i, items in served:
+            record_suggestions(parsed[i][0]["query"], items)
+
+    def _write_line(self, payload: dict):
+        self.wfile.write(json.dumps(payload, ensure_ascii=False, default=to_json).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
     def _serve_static(self, path: str):
         try:
             if not os.path.isdir(UI_DIR):
@@ -206,7 +472,7 @@ class Handler(BaseHTTPRequestHandler):
 
 def main():
     try:
-        httpd = ThreadingHTTPServer((HOST, PORT), Handler)
+        httpd = Server((HOST, PORT), Handler)
         httpd.serve_forever()
     except KeyboardInterrupt:
         pass
@@ -1,5 +1,6 @@
 # newssearch/config.py
 import os
+import secrets
 from pathlib import Path
 from dotenv import load_dotenv, find_dotenv
 
@@ -16,6 +17,9 @@ PORT = int(os.getenv("PORT", "8080"))
 
 GUARDIAN_KEY = os.getenv("GUARDIAN_API_KEY", "")
 NYT_KEY = os.getenv("NYT_API_KEY", "")
+# Upstream endpoints are overridable so benchmarks can point at local stand-ins
+GUARDIAN_API_URL = os.getenv("GUARDIAN_API_URL", "https://content.guardianapis.com/search")
+NYT_API_URL = os.getenv("NYT_API_URL", "https://api.nytimes.com/svc/search/v2/articlesearch.json")
 
 OFFLINE_DEFAULT = os.getenv("OFFLINE_DEFAULT", "0") == "1"
 UI_DIR = os.path.join(os.path.dirname(__file__), "../ui_build")
@@ -24,8 +28,59 @@ ALLOWED_ORIGIN = os.getenv("ALLOWED_ORIGIN", "http://localhost:3000")
 
 # If you had dev defaults like "dev-secret" here, replace with a neutral fallback
 API_SECRET_KEY = os.getenv("API_SECRET_KEY", "changeme")
+# Signs /search pagination cursors. Server-only: API_SECRET_KEY is held by every client (and the UI
+# bundle), so it cannot authenticate anything the server issues. Unset = a random key per process,
+# so cursors only resume on the instance that issued them and until it restarts.
+CURSOR_SECRET = os.getenv("CURSOR_SECRET", "") or secrets.token_urlsafe(32)
+# /debug/profile, /debug/threads, /debug/alloc: off (404) unless enabled AND a DEBUG_TOKEN is set.
+# They take their own bearer token, never API_SECRET_KEY, which every client holds.
+DEBUG_ENDPOINTS = os.getenv("DEBUG_ENDPOINTS", "0") == "1"
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN", "")
 
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_DB = int(os.getenv("REDIS_DB", "0"))
 REDIS_CACHE_TTL = int(os.getenv("REDIS_CACHE_TTL", "300"))
+# Comma-separated "host:port[/db]" list; more than one node shards keys client-side (consistent hashing).
+# Empty = the single REDIS_HOST:REDIS_PORT/REDIS_DB node.
+REDIS_NODES = [n.strip() for n in os.getenv("REDIS_NODES", "").split(",") if n.strip()]
+REDIS_REPLICAS = int(os.getenv("REDIS_REPLICAS", "2"))  # copies of each cache key when sharded
+REDIS_NODE_FAILURES = int(os.getenv("REDIS_NODE_FAILURES", "3"))  # consecutive errors before a node is dropped
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "0.5"))  # wait for a free pooled connection
+BUSY_RETRY_AFTER = int(os.getenv("BUSY_RETRY_AFTER", "1"))  # Retry-After seconds on 503 cache_unavailable
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "1.0"))
+# Cache writes go through a background writer unless disabled; the queue bounds memory under Redis stalls
+REDIS_ASYNC_WRITES = os.getenv("REDIS_ASYNC_WRITES", "1") == "1"
+REDIS_WRITE_QUEUE = int(os.getenv("REDIS_WRITE_QUEUE", "1000"))
+# Per-provider result cache TTLs, e.g. "guardian=300,nyt=600"; unlisted providers use REDIS_CACHE_TTL,
+# 0 disables provider-level caching (the rss provider is already served from memory)
+PROVIDER_CACHE_TTLS = {
+    k.strip(): int(v)
+    for k, v in (kv.split("=", 1) for kv in os.getenv("PROVIDER_CACHE_TTLS", "rss=0").split(",") if "=" in kv)
+}
+# Failed/degraded provider results and pages built from them are only cached this long
+NEGATIVE_CACHE_TTL = int(os.getenv("NEGATIVE_CACHE_TTL", "30"))
+# Query canonicalization (case/whitespace/term order always on); stemming/stopwords fold cache keys only
+QUERY_STEMMING = os.getenv("QUERY_STEMMING", "0") == "1"
+QUERY_STOPWORDS = os.getenv("QUERY_STOPWORDS", "0") == "1"
+INGRESS_RATE_LIMIT = int(os.getenv("INGRESS_RATE_LIMIT", "60"))  # requests per minute per API key/IP
+# Provider fan-out: in-flight upstream calls per provider (its own pool), shared across requests
+PROVIDER_CONCURRENCY = int(os.getenv("PROVIDER_CONCURRENCY", "4"))
+# Deepest ?page= served by offset paging (it reads provider pages 1..page); use cursors beyond it
+OFFSET_MAX_PAGES = int(os.getenv("OFFSET_MAX_PAGES", "20"))
+# Provider pages one cursor page may read past its start (stale cursors resume over several requests)
+CURSOR_MAX_WALK_PAGES = int(os.getenv("CURSOR_MAX_WALK_PAGES", "5"))
+# /suggest prefix index: frequency half-life and size cap
+SUGGEST_HALF_LIFE_HOURS = float(os.getenv("SUGGEST_HALF_LIFE_HOURS", "6"))
+SUGGEST_MAX_PHRASES = int(os.getenv("SUGGEST_MAX_PHRASES", "50000"))
+# POST /search/batch: max specs per call (each counts against INGRESS_RATE_LIMIT)
+BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "25"))
+
+# Comma-separated provider names from newssearch.providers.registry (guardian, nyt, rss)
+NEWS_PROVIDERS = [p.strip() for p in os.getenv("NEWS_PROVIDERS", "guardian,nyt").split(",") if p.strip()]
+# RSS/Atom feeds are ingested in the background, never on the request path
+RSS_FEEDS = [u.strip() for u in os.getenv("RSS_FEEDS", "").split(",") if u.strip()]
+RSS_INGEST_INTERVAL = int(os.getenv("RSS_INGEST_INTERVAL", "300"))
+RSS_MAX_ITEMS = int(os.getenv("RSS_MAX_ITEMS", "10000"))
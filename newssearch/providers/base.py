@@ -1,6 +1,129 @@
+import http.client
+import json
+import socket
+import sys
+import urllib.error
+import urllib.request
 from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from newssearch.utils.circuit_breaker import CircuitBreaker
+from newssearch.utils.logging_setup import configure_logging_from_env
+
+logger = configure_logging_from_env(__name__)
+
+class EgressDenied(Exception):
+    """Our own egress limiter refused the call; nothing was sent upstream."""
+
+def is_transient(exc: BaseException) -> bool:
+    """Transport failures worth retrying: timeouts, resets, 5xx and 429."""
+    if isinstance(exc, urllib.error.HTTPError):
+        return exc.code >= 500 or exc.code == 429
+    return isinstance(exc, (urllib.error.URLError, socket.timeout, ConnectionError, http.client.HTTPException))
 
 class NewsProvider(ABC):
     @abstractmethod
     def fetch(self, query, page, page_size, offline):
         pass
+
+class UpstreamNewsProvider(NewsProvider):
+    """
+    Shared plumbing for providers backed by a JSON HTTP API: egress limiting,
+    circuit breaker, retries and offline fallback live here once. Subclasses
+    only describe their upstream (name, offline file, URL, normalizer).
+    """
+    name: str = ""
+    offline_file: str = ""
+    timeout: float = 6
+    # fixed upstream page size, when the API ignores the requested one (None: honours page_size)
+    native_page_size: Optional[int] = None
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        breaker: CircuitBreaker,
+        egress_limiter: Optional[object] = None,  # duck-typed limiter: needs .allow(str)->bool
+    ):
+        self.api_key = api_key
+        self.breaker = breaker
+        self.egress_limiter = egress_limiter
+        logger.debug("%s initialized | api_key_present=%s", self.__class__.__name__, bool(api_key))
+
+    @abstractmethod
+    def build_url(self, query: str, page: int, page_size: int) -> str:
+        pass
+
+    @abstractmethod
+    def normalize(self, data: Dict[str, Any], page_size: int) -> Dict[str, Any]:
+        pass
+
+    def _check_egress_limit(self) -> None:
+        lim = self.egress_limiter
+        if lim and hasattr(lim, "allow") and not lim.allow(self.name):
+            raise EgressDenied(f"{self.name} egress rate limit exceeded")
+
+    def _load_offline(self) -> Dict[str, Any]:
+        # try several locations so tests/dev don’t break on cwd
+        candidates = [
+            Path("data") / self.offline_file,
+            Path(self.offline_file),
+            Path(__file__).resolve().parent.parent / "data" / self.offline_file,
+        ]
+        for p in candidates:
+            try:
+                if p.exists():
+                    with open(p, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                        logger.debug("Loaded offline %s data from %s", self.name, p)
+                        return data
+            except Exception as e:
+                logger.error("offline_load_fail path=%s err=%s", p, e, exc_info=True)
+        raise FileNotFoundError(f"{self.offline_file} not found in: {', '.join(map(str, candidates))}")
+
+    def _offline_page(self, page: int, page_size: int) -> Dict[str, Any]:
+        # the fixture is one snapshot; page it like the upstream would, with an honest total
+        full = self.normalize(self._load_offline(), sys.maxsize) or {"items": [], "total": 0}
+        start = (page - 1) * page_size
+        return {"items": full["items"][start:start + page_size], "total": len(full["items"])}
+
+    # transport errors are retried with jittered backoff inside one breaker call,
+    # so a fetch counts as at most one breaker failure
+    @retry(stop=stop_after_attempt(3), wait=wait_random_exponential(multiplier=0.1, max=1),
+           retry=retry_if_exception(is_transient), reraise=True)
+    def _fetch_api(self, url: str) -> Dict[str, Any]:
+        logger.info("%s API request: %s", self.name, url)
+        with urllib.request.urlopen(url, timeout=self.timeout) as r:
+            raw = r.read().decode("utf-8")
+            logger.debug("%s API response bytes=%d", self.name, len(raw))
+            return json.loads(raw)
+
+    def _call_upstream(self, url: str) -> Dict[str, Any]:
+        # a local egress denial is not an upstream failure: one token, no breaker count, no retry
+        self._check_egress_limit()
+        return self.breaker.call(self._fetch_api, url)
+
+    def fetch(self, query: str, page: int, page_size: int, offline: bool):
+        logger.info("Fetch start | provider=%s query=%r, page=%s, page_size=%s, offline=%s",
+                    self.name, query, page, page_size, offline)
+
+        degraded = False
+        if offline or not self.api_key:
+            normalized = self._offline_page(page, page_size)
+        else:
+            url = self.build_url(query, page, page_size)
+            try:
+                data = self._call_upstream(url)
+                logger.info("%s API call succeeded.", self.name)
+                normalized = self.normalize(data, page_size) or {"items": [], "total": 0}
+            except Exception as e:
+                logger.error("%s upstream error: %s. Falling back to offline.", self.name, e, exc_info=True)
+                normalized = self._offline_page(page, page_size)
+                degraded = True
+
+        if degraded:
+            # lets callers avoid caching fallback data as if it were fresh
+            normalized["degraded"] = True
+        return normalized
@@ -0,0 +1,173 @@
+from __future__ import annotations
+import re
+import threading
+import urllib.request
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from datetime import timezone
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import defusedxml.ElementTree as SafeET
+
+from newssearch.providers.base import NewsProvider
+from newssearch.utils.article import Article, tokenize
+from newssearch.utils.circuit_breaker import CircuitBreaker
+from newssearch.utils.logging_setup import configure_logging_from_env
+
+logger = configure_logging_from_env(__name__)
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_TAG_RE = re.compile(r"<[^>]+>")
+
+def _text(el: Optional[ET.Element]) -> str:
+    return (el.text or "").strip() if el is not None else ""
+
+def _rss_date(value: str) -> str:
+    # RSS uses RFC 822 dates; store ISO 8601 like the other providers
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return value or ""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
+def parse_feed(raw: bytes) -> List[Article]:
+    """Parse an RSS 2.0 or Atom document into normalized Articles."""
+    # remote XML: defusedxml rejects entity-expansion and external-entity payloads
+    root = SafeET.fromstring(raw)
+    out = []
+    if root.tag == f"{_ATOM}feed":
+        website = _text(root.find(f"{_ATOM}title"))
+        for e in root.iter(f"{_ATOM}entry"):
+            link = e.find(f"{_ATOM}link[@rel='alternate']")
+            if link is None:
+                link = e.find(f"{_ATOM}link")
+            summary = _text(e.find(f"{_ATOM}summary")) or _text(e.find(f"{_ATOM}content"))
+            out.append(Article(
+                "rss",
+                _text(e.find(f"{_ATOM}title")),
+                _TAG_RE.sub("", summary)[:280],
+                link.get("href") if link is not None else "",
+                _text(e.find(f"{_ATOM}published")) or _text(e.find(f"{_ATOM}updated")),
+                website,
+            ))
+        return out
+
+    channel = root.find("channel")
+    website = _text(channel.find("title")) if channel is not None else ""
+    for it in root.iter("item"):
+        out.append(Article(
+            "rss",
+            _text(it.find("title")),
+            _TAG_RE.sub("", _text(it.find("description")))[:280],
+            _text(it.find("link")),
+            _rss_date(_text(it.find("pubDate"))),
+            website,
+        ))
+    return out
+
+class FeedStore:
+    """
+    Thread-safe in-memory store of ingested feed articles, newest first.
+    Token sets are computed at ingest time so request-time search is a set test.
+    """
+    def __init__(self, max_items: int = 10000):
+        self._max = max_items
+        self._lock = threading.Lock()
+        self._by_url: Dict[str, Article] = {}
+        self._index: List[Tuple[FrozenSet[str], Article]] = []
+
+    def add_many(self, items: List[Article]) -> int:
+        added = 0
+        with self._lock:
+            for it in items:
+                u = it.canon_url
+                if not u:
+                    continue
+                if u not in self._by_url:
+                    added += 1
+                self._by_url[u] = it
+            ordered = sorted(self._by_url.values(), key=lambda x: x.ts, reverse=True)
+            if len(ordered) > self._max:
+                for old in ordered[self._max:]:
+                    self._by_url.pop(old.canon_url, None)
+                ordered = ordered[:self._max]
+            # swap in a new list so readers never see a half-built index
+            self._index = [(it.title_tokens | it.desc_tokens, it) for it in ordered]
+        return added
+
+    def search(self, query: str) -> List[Article]:
+        terms = tokenize(query)
+        index = self._index
+        if not terms:
+            return [it for _, it in index]
+        return [it for toks, it in index if terms <= toks]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+class FeedIngestor:
+    """
+    Pulls every configured feed on a schedule and bulk-loads the store.
+    Runs on a daemon thread, so feeds never add latency to /search.
+    """
+    def __init__(
+        self,
+        store: FeedStore,
+        feeds: List[str],
+        interval_seconds: int = 300,
+        opener: Optional[Callable[..., Any]] = None,
+        timeout: float = 10,
+    ):
+        self._store = store
+        self._feeds = feeds
+        self._interval = interval_seconds
+        self._open = opener
+        self._timeout = timeout
+        self._breakers = {f: CircuitBreaker(fail_max=3, reset_timeout=interval_seconds * 3) for f in feeds}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _fetch_feed(self, url: str) -> List[Article]:
+        opener = self._open or urllib.request.urlopen
+        with opener(url, timeout=self._timeout) as r:
+            return parse_feed(r.read())
+
+    def ingest_once(self) -> int:
+        batch = []
+        for url in self._feeds:
+            try:
+                batch.extend(self._breakers[url].call(self._fetch_feed, url))
+            except Exception as e:
+                logger.error("feed_ingest_fail url=%s err=%s", url, e, exc_info=True)
+        added = self._store.add_many(batch)
+        logger.info("feed_ingest_done feeds=%d fetched=%d added=%d stored=%d",
+                    len(self._feeds), len(batch), added, len(self._store))
+        return added
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.ingest_once()
+            self._stop.wait(self._interval)
+
+    def start(self) -> None:
+        if self._thread is None and self._feeds:
+            self._thread = threading.Thread(target=self._run, name="feed-ingestor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+class FeedProvider(NewsProvider):
+    """Serves search results from the locally ingested feed store only."""
+    name = "rss"
+
+    def __init__(self, store: FeedStore, ingestor: Optional[FeedIngestor] = None):
+        self.store = store
+        self.ingestor = ingestor
+
+    def fetch(self, query: str, page: int, page_size: int, offline: bool):
+        matches = self.store.search(query)
+        start = (page - 1) * page_size
+        return {"items": matches[start:start + page_size], "total": len(matches)}
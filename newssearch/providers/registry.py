@@ -0,0 +1,44 @@
+from __future__ import annotations
+from typing import Callable, Dict, List
+
+from newssearch.providers.base import NewsProvider
+from newssearch.utils.logging_setup import configure_logging_from_env
+
+logger = configure_logging_from_env(__name__)
+
+ProviderFactory = Callable[[], NewsProvider]
+
+PROVIDER_REGISTRY: Dict[str, ProviderFactory] = {}
+
+def register_provider(name: str, factory: ProviderFactory) -> None:
+    PROVIDER_REGISTRY[name] = factory
+
+def build_providers(names: List[str]) -> List[NewsProvider]:
+    providers = []
+    for name in names:
+        factory = PROVIDER_REGISTRY.get(name)
+        if factory is None:
+            logger.error("provider_unknown name=%s known=%s", name, sorted(PROVIDER_REGISTRY))
+            continue
+        providers.append(factory())
+    return providers
+
+def _guardian() -> NewsProvider:
+    from newssearch.providers.guardian import GuardianProvider
+    return GuardianProvider()
+
+def _nyt() -> NewsProvider:
+    from newssearch.providers.nyt import NYTProvider
+    return NYTProvider()
+
+def _rss() -> NewsProvider:
+    from newssearch.config import RSS_FEEDS, RSS_INGEST_INTERVAL, RSS_MAX_ITEMS
+    from newssearch.providers.feed import FeedIngestor, FeedProvider, FeedStore
+    store = FeedStore(max_items=RSS_MAX_ITEMS)
+    ingestor = FeedIngestor(store, RSS_FEEDS, interval_seconds=RSS_INGEST_INTERVAL)
+    ingestor.start()
+    return FeedProvider(store, ingestor)
+
+register_provider("guardian", _guardian)
+register_provider("nyt", _nyt)
+register_provider("rss", _rss)
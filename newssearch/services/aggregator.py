@@ -1,13 +1,49 @@
 from __future__ import annotations
-from typing import List, Dict
-from newssearch.providers.guardian import GuardianProvider
-from newssearch.providers.nyt import NYTProvider
+import heapq
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Iterator, Tuple
+from newssearch.utils.article import Article
 from newssearch.utils.cache import Cache
-from newssearch.utils.strategies import DedupeStrategy, SortStrategy
+from newssearch.utils.cursor import cursor_digest
+from newssearch.utils.strategies import DedupeStrategy, SortStrategy, RelevanceSort
 from newssearch.utils.logging_setup import configure_logging_from_env
 
 logger = configure_logging_from_env(__name__)
 
+MAX_PROVIDER_PAGES = 1000  # same ceiling as /search?page=
+
+class _WalkCapped:
+    """Stands in a cursor stream once it used its page-walk budget for this request."""
+    __slots__ = ("ts", "canon_url")
+
+    def __init__(self, ts: float, canon_url: Optional[str]):
+        self.ts, self.canon_url = ts, canon_url
+
+@dataclass(frozen=True)
+class SearchSpec:
+    """
+    One page request; `cursor`/`positions` set means the keyset (date) path.
+    `query` goes upstream; `cache_query` (the folded form, if any) keys the page cache.
+    """
+    query: str
+    page: int
+    page_size: int
+    offline: bool
+    sort: str = "date"
+    cursor: str = ""
+    positions: Optional[Dict[str, list]] = None
+    keyset: bool = False
+    cache_query: str = ""
+
+    @property
+    def key(self) -> str:
+        query = self.cache_query or self.query
+        if self.keyset:
+            return Aggregator.cache_key(query, 0, self.page_size, self.offline, self.sort, self.cursor)
+        return Aggregator.cache_key(query, self.page, self.page_size, self.offline, self.sort)
+
 class Aggregator:
     def __init__(
         self,
@@ -16,40 +52,335 @@ class Aggregator:
         dedupe: DedupeStrategy,
         sorter: SortStrategy,
         cache_ttl: int,
+        rankers: Optional[Dict[str, RelevanceSort]] = None,  # sort name -> query-aware ranker
+        provider_ttls: Optional[Dict[str, int]] = None,      # provider name -> TTL; 0 disables
+        negative_ttl: int = 30,                              # TTL for failed/degraded fetches
+        provider_concurrency: int = 4,                       # in-flight upstream calls per provider
+        max_offset_pages: int = 20,                          # deepest ?page= served; cursors go further
+        max_walk_pages: int = 5,                             # extra provider pages one cursor page may read
     ):
         self._providers = providers
         self._cache = cache
         self._dedupe = dedupe
         self._sorter = sorter
         self._ttl = cache_ttl
+        self._rankers = rankers or {}
+        self._provider_ttls = provider_ttls or {}
+        self._negative_ttl = negative_ttl
+        self._max_offset_pages = max_offset_pages
+        self._max_walk_pages = max_walk_pages
+        # one pool per provider, sized to its budget and shared by every request and
+        # batch on this instance: a stalled provider queues only its own fetches
+        self._concurrency = provider_concurrency
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._pool_lock = threading.Lock()
+
+    @staticmethod
+    def _name(p) -> str:
+        return getattr(p, "name", "") or p.__class__.__name__
+
+    def _provider_ttl(self, p) -> int:
+        return self._provider_ttls.get(self._name(p), self._ttl)
+
+    def _provider_key(self, p, query: str, page: int, page_size: int, offline: bool) -> str:
+        return f"prov:{self._name(p)}:{query}:{page}:{page_size}:{offline}"
+
+    def _executor(self, p) -> ThreadPoolExecutor:
+        name = self._name(p)
+        with self._pool_lock:
+            if name not in self._pools:
+                self._pools[name] = ThreadPoolExecutor(max_workers=self._concurrency,
+                                                       thread_name_prefix=f"fetch-{name}")
+            return self._pools[name]
+
+    def _submit(self, p, key: str, query: str, page: int, page_size: int, offline: bool) -> "Future[dict]":
+        return self._executor(p).submit(self._fetch_one, p, key, query, page, page_size, offline)
 
-    def aggregate(self, query: str, page: int, page_size: int, offline: bool) -> dict:
-        key = f"agg:{query}:{page}:{page_size}:{offline}"
-        cached = self._cache.get_json(key)
-        if cached:
-            return cached
+    def _fetch_one(self, p, key: str, query: str, page: int, page_size: int, offline: bool) -> dict:
+        try:
+            data = p.fetch(query, page, page_size, offline)
+            if not (data and "items" in data and "total" in data):
+                data = {"items": [], "total": 0, "degraded": True}
+        except Exception as e:
+            logger.error("provider_fail name=%s err=%s", self._name(p), e, exc_info=True)
+            data = {"items": [], "total": 0, "degraded": True}
+        ttl = self._negative_ttl if data.get("degraded") else self._provider_ttl(p)
+        if self._provider_ttl(p) > 0:
+            self._cache.set_json(key, data, ttl)
+        return data
 
-        # Run providers sequentially to keep it simple & predictable;
-        # swap to threads if needed — but keep that detail inside this class.
-        results, totals = [], []
+    @staticmethod
+    def _revive(data: Optional[dict]) -> Optional[dict]:
+        if data is not None:
+            data["items"] = [Article.from_dict(d) for d in data["items"]]
+        return data
+
+    def _prefetch(self, needed: Dict[str, tuple]) -> Tuple[Dict[str, dict], Dict[str, "Future[dict]"]]:
+        """
+        `needed` maps provider cache key -> (provider, query, page, page_size, offline).
+        One MGET resolves every cacheable entry; the misses are submitted to their
+        providers' pools. Returns (hits, futures).
+        """
+        cacheable = [k for k, (p, *_) in needed.items() if self._provider_ttl(p) > 0]
+        hits = {k: self._revive(v) for k, v in zip(cacheable, self._cache.get_many_json(cacheable)) if v is not None}
+        return hits, {k: self._submit(needed[k][0], k, *needed[k][1:]) for k in needed if k not in hits}
+
+    @staticmethod
+    def _fetch_size(p, page_size: int) -> int:
+        # providers with a fixed upstream page size (NYT: 10) are read in their own units
+        return getattr(p, "native_page_size", None) or page_size
+
+    def _position(self, p, spec: SearchSpec) -> Optional[list]:
+        """`p`'s cursor position as [page, offset, ts, canon_url] in its fetch size."""
+        pos = (spec.positions or {}).get(self._name(p))
+        if not pos:
+            return None
+        page, off, ts, url = int(pos[0]), int(pos[1]), pos[2], pos[3]
+        size = int(pos[4]) if len(pos) > 4 else spec.page_size  # older cursors: the requested size
+        fetch = self._fetch_size(p, spec.page_size)
+        if size != fetch:
+            read = (page - 1) * size + off
+            page, off = read // fetch + 1, read % fetch
+        return [page, off, ts, url]
+
+    def _provider_pages(self, p, spec: SearchSpec) -> List[int]:
+        if spec.keyset:
+            return [(self._position(p, spec) or [1])[0]]
+        if spec.page > self._max_offset_pages:
+            return []
+        # provider pages covering merged pages 1..page
+        return list(range(1, -(-spec.page * spec.page_size // self._fetch_size(p, spec.page_size)) + 1))
+
+    def _spec_needs(self, spec: SearchSpec) -> Dict[str, tuple]:
+        """Provider entries a spec reads, provider-major (keyset: one page each)."""
+        out = {}
         for p in self._providers:
-            try:
-                data = p.fetch(query, page, page_size, offline)
-                if data and "items" in data and "total" in data:
-                    results.extend(data["items"])
-                    totals.append(data["total"])
-            except Exception as e:
-                logger.error("provider_fail name=%s err=%s", p.__class__.__name__, e, exc_info=True)
+            size = self._fetch_size(p, spec.page_size)
+            for page in self._provider_pages(p, spec):
+                out[self._provider_key(p, spec.query, page, size, spec.offline)] = \
+                    (p, spec.query, page, size, spec.offline)
+        return out
 
-        items = self._dedupe.dedupe(results)
-        items = self._sorter.sort(items)
+    def _fetch_providers(self, spec: SearchSpec) -> List[dict]:
+        """
+        Per-provider results for one page, each cached independently so only the
+        providers whose entries are missing or expired hit upstream; those run
+        concurrently. Degraded results (upstream failed, offline fallback served)
+        are cached for `negative_ttl` only.
+        """
+        needed = self._spec_needs(spec)
+        hits, futures = self._prefetch(needed)
+        return [hits[k] if k in hits else futures[k].result() for k in needed]
 
-        sum_total = sum(totals) if totals else len(items)
-        total_pages = max(1, (sum_total + page_size - 1) // page_size)
+    def _provider_page(self, p, query: str, page: int, page_size: int, offline: bool) -> dict:
+        key = self._provider_key(p, query, page, page_size, offline)
+        data = self._revive(self._cache.get_json(key)) if self._provider_ttl(p) > 0 else None
+        return data if data is not None else self._submit(p, key, query, page, page_size, offline).result()
+
+    @staticmethod
+    def cache_key(query: str, page: int, page_size: int, offline: bool, sort: str = "date", cursor: str = "") -> str:
+        if cursor:
+            return f"agg:{query}:c{cursor_digest(cursor)}:{page_size}:{offline}:{sort}"
+        return f"agg:{query}:{page}:{page_size}:{offline}:{sort}"
 
-        start = (page - 1) * page_size
-        end = start + page_size
-        out = {"items": items[start:end], "total_estimated_pages": total_pages}
+    def aggregate(
+        self, query: str, page: int, page_size: int, offline: bool, sort: str = "date",
+        check_cache: bool = True,  # False when the caller already looked the page up
+    ) -> dict:
+        return self.aggregate_spec(SearchSpec(query, page, page_size, offline, sort), check_cache)
 
-        self._cache.set_json(key, out, self._ttl)
+    def aggregate_spec(self, spec: SearchSpec, check_cache: bool = True) -> dict:
+        """aggregate/aggregate_cursor for a prepared spec (keyset or page path)."""
+        if check_cache:
+            cached = self._cache.get_json(spec.key)
+            if cached:
+                return cached
+        return self._finish(spec, self._fetch_providers(spec))
+
+    def _finish(self, spec: SearchSpec, results: List[dict]) -> dict:
+        out, degraded = (self._assemble_keyset if spec.keyset else self._assemble)(spec, results)
+        # a degraded page must not outlive the outage it reflects
+        self._cache.set_json(spec.key, out, self._negative_ttl if degraded else self._ttl)
         return out
+
+    def _assemble(self, spec: SearchSpec, results: List[dict]) -> Tuple[dict, bool]:
+        """
+        Page N of the merged order draws on each provider's first N*page_size
+        items: any provider may hold every item of the first N merged pages. Each
+        provider's pages are joined into one stream (stopping at its first empty
+        page), the streams merged, and page N sliced out. Pages past
+        `max_offset_pages` are empty and not advertised; the cursor path serves those depths.
+        """
+        if spec.page > self._max_offset_pages:
+            return {"items": [], "total_estimated_pages": self._max_offset_pages}, False
+        ps = spec.page_size
+        streams, totals, degraded, i = [], [], False, 0
+        for p in self._providers:
+            n = len(self._provider_pages(p, spec))
+            pages, i = results[i:i + n], i + n
+            degraded = degraded or any(d.get("degraded") for d in pages)
+            if not pages or (pages[0].get("degraded") and not pages[0]["items"]):
+                continue
+            stream = []
+            for data in pages:
+                if not data["items"]:
+                    break
+                stream.extend(data["items"])
+            streams.append(stream)
+            totals.append(pages[0]["total"])
+
+        start = (spec.page - 1) * ps
+        end = start + ps
+
+        ranker = self._rankers.get(spec.sort)
+        if ranker is not None and hasattr(ranker, "rank_bands"):
+            # band k: each provider's k-th page_size slice
+            # each provider page only joins the ranking once its merged page is reached,
+            # so earlier pages never change as the user pages forward
+            bands = [[it for s in streams for it in s[b * ps:(b + 1) * ps]] for b in range(spec.page)]
+            items = ranker.rank_bands(bands, self._dedupe, ps, spec.query)
+        elif ranker is not None:
+            items = ranker.rank(self._dedupe.dedupe([it for s in streams for it in s]), spec.query)
+        elif hasattr(self._sorter, "merge"):
+            # streaming path: k-way merge of the per-provider streams, stops at `end`
+            items = self._sorter.merge(streams, self._dedupe, end)
+        else:
+            items = self._dedupe.dedupe([it for s in streams for it in s])
+            items = self._sorter.sort(items)
+
+        sum_total = sum(totals) if totals else len(items)
+        total_pages = max(1, (sum_total + ps - 1) // ps)
+        return {"items": items[start:end],
+                "total_estimated_pages": min(total_pages, self._max_offset_pages)}, degraded
+
+    def _resume(self, idx: int, p, query: str, fetch_size: int, offline: bool,
+                page: int, data: dict, pos: Optional[list]) -> Iterator[Tuple[int, int, int, Article]]:
+        """
+        Yields (provider index, provider page, offset, article) newest-first, starting
+        just after the cursor position `pos` = [page, offset, ts, canon_url] (in
+        `fetch_size` pages). The offset is used when the page is unchanged; either way
+        anything newer than the last yielded (ts, canon_url) keyset is skipped, so pages
+        that shifted upstream (new articles on top) or repeat (offline fixtures) never
+        replay items. At most `max_walk_pages` further pages are read; past that the
+        stream ends with (idx, next page, -1, _WalkCapped) so the page can stop there.
+        """
+        order = getattr(self._sorter, "ordered", None) or (lambda s: sorted(s, key=lambda a: a.ts, reverse=True))
+        items = order(data["items"])
+        offset, last_ts, last_url = 0, float("inf"), None
+        if pos:
+            _, off, last_ts, last_url = pos
+            if 0 < off <= len(items) and items[off - 1].canon_url == last_url:
+                offset = off  # page unchanged: the offset is exact
+        walked = 0
+        while True:
+            for j in range(offset, len(items)):
+                it = items[j]
+                if it.ts > last_ts or it.canon_url == last_url:
+                    continue
+                last_ts, last_url = it.ts, it.canon_url
+                yield idx, page, j, it
+            if (not items or data.get("degraded") or page * fetch_size >= data["total"]
+                    or page >= MAX_PROVIDER_PAGES):
+                return
+            if walked >= self._max_walk_pages:
+                yield idx, page + 1, -1, _WalkCapped(last_ts, last_url)
+                return
+            page, offset, walked = page + 1, 0, walked + 1
+            data = self._provider_page(p, query, page, fetch_size, offline)
+            items = order(data["items"])
+
+    def aggregate_cursor(
+        self, query: str, page_size: int, offline: bool,
+        positions: Optional[Dict[str, list]] = None,  # provider name -> [page, offset, ts, canon_url, size]
+        cursor: str = "", check_cache: bool = True,
+    ) -> dict:
+        """
+        Keyset pagination (date order): each provider stream resumes at its cursor
+        position, so page N costs the same provider pages as page 1. Returns the
+        page plus `next` positions (None when every stream is exhausted). A stream
+        that must skip more than `max_walk_pages` pages (a stale cursor) ends the page
+        early with `partial` set; `next` continues from where it stopped.
+        """
+        return self.aggregate_spec(SearchSpec(query, 0, page_size, offline, "date", cursor, positions, keyset=True),
+                                   check_cache)
+
+    def _assemble_keyset(self, spec: SearchSpec, first: List[dict]) -> Tuple[dict, bool]:
+        positions = spec.positions or {}
+        names = [self._name(p) for p in self._providers]
+        sizes = [self._fetch_size(p, spec.page_size) for p in self._providers]
+        starts = [self._position(p, spec) for p in self._providers]
+        degraded = any(d.get("degraded") for d in first)
+        totals = [d["total"] for d in first if not (d.get("degraded") and not d["items"])]
+
+        streams = [self._resume(i, p, spec.query, sizes[i], spec.offline, (starts[i] or [1])[0], first[i], starts[i])
+                   for i, p in enumerate(self._providers)]
+        dedupe_key = self._dedupe.article_key() if hasattr(self._dedupe, "article_key") else self._dedupe.key
+        seen, items, last, more, partial = set(), [], {}, False, False
+        for idx, pg, off, it in heapq.merge(*streams, key=lambda e: e[3].ts, reverse=True):
+            if len(items) >= spec.page_size:
+                more = True
+                break
+            last[idx] = (pg, off, it)
+            if off < 0:
+                # that stream spent its walk budget: nothing older can be placed yet
+                more = partial = True
+                break
+            u = dedupe_key(it)
+            if not u or u in seen:
+                continue
+            seen.add(u); items.append(it)
+
+        next_pos = dict(positions)
+        for idx, (pg, off, it) in last.items():
+            next_pos[names[idx]] = [pg, off + 1, it.ts, it.canon_url, sizes[idx]]
+
+        sum_total = sum(totals) if totals else len(items)
+        out = {
+            "items": items,
+            "total_estimated_pages": max(1, (sum_total + spec.page_size - 1) // spec.page_size),
+            "next": next_pos if more else None,
+        }
+        if partial:
+            out["partial"] = True
+        return out, degraded
+
+    def aggregate_many(self, specs: List[SearchSpec]) -> Iterator[Tuple[int, Optional[dict]]]:
+        """
+        Batch form of aggregate/aggregate_cursor for pages the caller already missed
+        in the page cache. Provider entries for every spec are read with one MGET, and
+        distinct provider misses are fetched once each, concurrently, on the
+        shared per-provider pools. Yields (index, page) as soon as each spec's
+        providers are in; (index, None) if assembling that page failed.
+        """
+        needs = [self._spec_needs(spec) for spec in specs]
+        needed: Dict[str, tuple] = {}
+        for n in needs:
+            needed.update(n)
+        found, futures = self._prefetch(needed)
+
+        waiting: Dict[str, List[int]] = {}
+        pending = []
+        for i, n in enumerate(needs):
+            missing = {k for k in n if k not in found}
+            pending.append(missing)
+            for k in missing:
+                waiting.setdefault(k, []).append(i)
+
+        def finish(i: int) -> Tuple[int, Optional[dict]]:
+            try:
+                return i, self._finish(specs[i], [found[k] for k in needs[i]])
+            except Exception as e:
+                logger.error("batch_item_fail index=%d query=%r err=%s", i, specs[i].query, e, exc_info=True)
+                return i, None
+
+        for i, missing in enumerate(pending):
+            if not missing:
+                yield finish(i)
+        by_future = {f: k for k, f in futures.items()}
+        for f in as_completed(by_future):
+            k = by_future[f]
+            found[k] = f.result()
+            for i in waiting[k]:
+                pending[i].discard(k)
+                if not pending[i]:
+                    yield finish(i)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import re
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, Optional
+
+EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+_EPOCH_TS = EPOCH.timestamp()
+_fromisoformat = datetime.fromisoformat
+
+def canon(url: str) -> str:
+    # Remove protocol (and www after it), trailing slashes, and lowercase
+    url = url.strip().lower()
+    if url.startswith(("http://", "https://")):
+        url = url[url.index("//") + 2:]
+        if url.startswith("www."):
+            url = url[4:]
+    return url.rstrip("/")
+
+def parse_published_at(value) -> datetime:
+    # Guardian sends "...Z", NYT sends "...+0000"; both become aware UTC datetimes.
+    # Missing/garbled values sort last (EPOCH) instead of raising.
+    if not value:
+        return EPOCH
+    try:
+        dt = _fromisoformat(value)  # 3.11+ reads both provider formats as-is
+    except (TypeError, ValueError):
+        try:
+            dt = _fromisoformat(value.strip().replace("Z", "+00:00"))
+        except (AttributeError, TypeError, ValueError):
+            return EPOCH
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(text: Optional[str]) -> FrozenSet[str]:
+    return frozenset(_TOKEN_RE.findall((text or "").lower()))
+
+_FIELDS = ("source", "title", "description", "url", "published_at", "website")
+
+class Article:
+    """
+    Compact normalized article: `__slots__` instead of a per-item dict, interned
+    source/website strings, and the parsed timestamp (`ts`, epoch seconds) and
+    canonical URL computed once at construction for dedupe/sort/rank. Title and
+    description token sets are kept in slots too, filled on first use: only
+    ranking and the feed index need them, and tokenizing costs ~20 µs per item.
+
+    Read-only mapping access (`a["url"]`, `a.get("url")`) is kept so code written
+    against the old dict items keeps working.
+    """
+    __slots__ = ("source", "title", "description", "url", "published_at", "website", "ts", "canon_url",
+                 "_title_tokens", "_desc_tokens")
+
+    def __init__(
+        self,
+        source: str,
+        title: Optional[str],
+        description: str,
+        url: Optional[str],
+        published_at: Optional[str],
+        website: str,
+    ):
+        self.source = sys.intern(source or "")
+        self.title = title
+        self.description = description or ""
+        self.url = url
+        self.published_at = published_at
+        self.website = sys.intern(website or "")
+        self.ts = parse_published_at(published_at).timestamp() if published_at else _EPOCH_TS
+        self.canon_url = canon(url or "")
+        self._title_tokens: Optional[FrozenSet[str]] = None
+        self._desc_tokens: Optional[FrozenSet[str]] = None
+
+    @property
+    def title_tokens(self) -> FrozenSet[str]:
+        if self._title_tokens is None:
+            self._title_tokens = tokenize(self.title)
+        return self._title_tokens
+
+    @property
+    def desc_tokens(self) -> FrozenSet[str]:
+        if self._desc_tokens is None:
+            self._desc_tokens = tokenize(self.description)
+        return self._desc_tokens
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Article":
+        return cls(d.get("source"), d.get("title"), d.get("description"), d.get("url"),
+                   d.get("published_at"), d.get("website"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "title": self.title,
+            "description": self.description,
+            "url": self.url,
+            "published_at": self.published_at,
+            "website": self.website,
+        }
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in _FIELDS else default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Article):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in _FIELDS)
+
+    __hash__ = None  # mutable record
+
+    def __repr__(self) -> str:
+        return f"Article(source={self.source!r}, url={self.url!r}, published_at={self.published_at!r})"
+
+def as_article(item: Any) -> Article:
+    return item if isinstance(item, Article) else Article.from_dict(item)
+
+def to_json(obj: Any) -> Any:
+    """`default=` hook for json.dumps so Articles serialize without an intermediate pass."""
+    if isinstance(obj, Article):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
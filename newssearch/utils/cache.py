@@ -1,18 +1,79 @@
 from __future__ import annotations
 import json
+import queue
+import threading
 import redis
-from typing import Protocol, Optional
+from typing import Protocol, Optional, List, Tuple
+from newssearch.utils.article import to_json
 from newssearch.utils.logging_setup import configure_logging_from_env
 
 logger = configure_logging_from_env(__name__)
 
+class CacheBusy(Exception):
+    """No pooled Redis connection came free in time: shed the request (503), it is not over its limit."""
+
 class Cache(Protocol):
     def get_json(self, key: str) -> Optional[dict]: ...
+    def get_many_json(self, keys: List[str]) -> List[Optional[dict]]: ...
     def set_json(self, key: str, value: dict, ttl: int) -> None: ...
 
+class BackgroundWriter:
+    """
+    Fire-and-forget SETEX: callers enqueue and return; a daemon thread drains the
+    queue and writes in pipelined batches. When the queue is full, writes are
+    dropped (it is a cache) rather than blocking request threads.
+    """
+    def __init__(self, client: redis.StrictRedis, max_queue: int = 1000, batch_size: int = 64):
+        self._client = client
+        self._q: "queue.Queue[Tuple[str, int, str]]" = queue.Queue(maxsize=max_queue)
+        self._batch = batch_size
+        self._thread = threading.Thread(target=self._run, name="cache-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, key: str, ttl: int, raw: str) -> None:
+        try:
+            self._q.put_nowait((key, ttl, raw))
+        except queue.Full:
+            logger.error("cache_write_dropped key=%s reason=queue_full", key)
+
+    def flush(self) -> None:
+        """Block until everything queued so far has been written (tests/shutdown)."""
+        self._q.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._q.get()]
+            while len(batch) < self._batch:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                p = self._client.pipeline(transaction=False)
+                for key, ttl, raw in batch:
+                    p.setex(key, ttl, raw)
+                p.execute()
+            except Exception as e:
+                logger.error("cache_store_fail keys=%d err=%s", len(batch), e, exc_info=True)
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+
 class RedisCache(Cache):
-    def __init__(self, host: str, port: int, db: int):
-        self._client = redis.StrictRedis(host=host, port=port, db=db, decode_responses=True)
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int,
+        client: Optional[redis.StrictRedis] = None,   # shared client/pool; built from host/port/db if omitted
+        writer: Optional[BackgroundWriter] = None,    # async writes when given
+    ):
+        self._client = client or redis.StrictRedis(host=host, port=port, db=db, decode_responses=True)
+        self._writer = writer
+
+    @property
+    def client(self) -> redis.StrictRedis:
+        return self._client
 
     def get_json(self, key: str) -> Optional[dict]:
         try:
@@ -22,8 +83,58 @@ class RedisCache(Cache):
             logger.error("cache_read_fail key=%s err=%s", key, e, exc_info=True)
             return None
 
+    def get_many_json(self, keys: List[str]) -> List[Optional[dict]]:
+        if not keys:
+            return []
+        try:
+            return [json.loads(raw) if raw else None for raw in self._client.mget(keys)]
+        except Exception as e:
+            logger.error("cache_read_fail keys=%s err=%s", keys, e, exc_info=True)
+            return [None] * len(keys)
+
+    def get_json_rate_limited(self, limiter, identity: str, key: str) -> Tuple[bool, Optional[dict]]:
+        """
+        Ingress rate-limit check and cache read in one pipelined round trip.
+        The limiter must share this cache's Redis; Redis errors fail open (allowed, miss),
+        except pool exhaustion, which raises CacheBusy.
+        """
+        allowed, values = self.get_many_json_rate_limited(limiter, identity, [key])
+        return allowed, values[0]
+
+    def get_many_json_rate_limited(
+        self, limiter, identity: str, keys: List[str], cost: int = 1,
+    ) -> Tuple[bool, List[Optional[dict]]]:
+        """Same as `get_json_rate_limited` for many keys (one MGET); `cost` is charged to the limiter."""
+        misses: List[Optional[dict]] = [None] * len(keys)
+        try:
+            p = self._client.pipeline()
+            bucket = limiter.queue(p, identity, cost)
+            p.mget(keys)
+            count, _, raws = p.execute()
+        except redis.exceptions.MaxConnectionsError as e:
+            # a saturated pool is load, not an outage: shed the request rather than skip the limit
+            logger.warning("cache_pool_exhausted identity=%s err=%s", identity, e)
+            raise CacheBusy(str(e)) from e
+        except Exception as e:
+            logger.error("cache_read_fail keys=%s err=%s", keys, e, exc_info=True)
+            return True, misses
+        if not limiter.check(bucket, count):
+            return False, misses
+        out = []
+        for key, raw in zip(keys, raws):
+            try:
+                out.append(json.loads(raw) if raw else None)
+            except ValueError as e:
+                logger.error("cache_decode_fail key=%s err=%s", key, e)
+                out.append(None)
+        return True, out
+
     def set_json(self, key: str, value: dict, ttl: int) -> None:
         try:
-            self._client.setex(key, ttl, json.dumps(value))
+            raw = json.dumps(value, default=to_json)
+            if self._writer is not None:
+                self._writer.submit(key, ttl, raw)
+            else:
+                self._client.setex(key, ttl, raw)
         except Exception as e:
             logger.error("cache_store_fail key=%s err=%s", key, e, exc_info=True)
@@ -1,4 +1,76 @@
-import pybreaker
+import threading
+import time
+from typing import Any, Callable
 
-guardian_breaker = pybreaker.CircuitBreaker(fail_max=3, reset_timeout=60)
-nyt_breaker = pybreaker.CircuitBreaker(fail_max=3, reset_timeout=60)
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+class CircuitOpen(Exception):
+    """The breaker is open (or its single half-open trial is in flight); nothing was called."""
+
+class CircuitBreaker:
+    """
+    Closed until `fail_max` consecutive failures, then open: calls are rejected
+    for `reset_timeout` seconds. After that exactly one trial call goes through
+    (half-open); its success closes the breaker, its failure re-opens it.
+
+    The lock only covers state transitions, never the wrapped call, so concurrent
+    requests to one provider run in parallel. (pybreaker holds its lock across the
+    call, which allowed a single in-flight upstream request per provider.)
+    """
+    def __init__(self, fail_max: int = 3, reset_timeout: float = 60,
+                 now_fn: Callable[[], float] = time.monotonic):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._now = now_fn
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def current_state(self) -> str:
+        return self._state
+
+    @property
+    def fail_counter(self) -> int:
+        return self._failures
+
+    def close(self) -> None:
+        with self._lock:
+            self._state, self._failures = CLOSED, 0
+
+    def _enter(self) -> bool:
+        # returns True when this caller is the half-open trial
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            if self._state == OPEN and self._now() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                return True
+            raise CircuitOpen(f"circuit {self._state}")
+
+    def _open(self) -> None:
+        self._state, self._opened_at = OPEN, self._now()
+
+    def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        trial = self._enter()
+        try:
+            ret = func(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                if trial:
+                    self._open()
+                elif self._state == CLOSED:
+                    self._failures += 1
+                    if self._failures >= self.fail_max:
+                        self._open()
+            raise
+        with self._lock:
+            if trial:
+                self._state, self._failures = CLOSED, 0
+            elif self._state == CLOSED:
+                self._failures = 0
+        return ret
+
+guardian_breaker = CircuitBreaker(fail_max=3, reset_timeout=60)
+nyt_breaker = CircuitBreaker(fail_max=3, reset_timeout=60)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+import base64
+import hashlib
+import hmac
+import json
+from typing import Any, Dict
+
+class InvalidCursor(ValueError):
+    pass
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+def _unb64(s: str) -> bytes:
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+def encode_cursor(state: Dict[str, Any], secret: str) -> str:
+    """Opaque `<payload>.<hmac>` token; the payload is compact JSON, base64url-encoded."""
+    payload = _b64(json.dumps(state, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+    sig = _b64(hmac.new(secret.encode("utf-8"), payload.encode("ascii"), hashlib.sha256).digest()[:16])
+    return f"{payload}.{sig}"
+
+def decode_cursor(token: str, secret: str) -> Dict[str, Any]:
+    try:
+        payload, sig = token.split(".", 1)
+        expected = _b64(hmac.new(secret.encode("utf-8"), payload.encode("ascii"), hashlib.sha256).digest()[:16])
+    except (ValueError, UnicodeEncodeError):
+        raise InvalidCursor("malformed cursor")
+    if not hmac.compare_digest(sig, expected):
+        raise InvalidCursor("bad cursor signature")
+    try:
+        state = json.loads(_unb64(payload))
+    except ValueError:
+        raise InvalidCursor("malformed cursor")
+    if not isinstance(state, dict):
+        raise InvalidCursor("malformed cursor")
+    return state
+
+def cursor_digest(token: str) -> str:
+    # short, cache-key-safe stand-in for a (possibly long) cursor token
+    return hashlib.sha1(token.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import traceback
+from collections import Counter
+from typing import Dict, List
+
+# Nothing here runs until a /debug endpoint is called: no hooks, no tracing,
+# no background thread. Sampling reads sys._current_frames() from the request
+# thread, so the profiled threads never execute profiler code.
+
+_profile_lock = threading.Lock()
+_alloc_lock = threading.Lock()
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+def _collapse(frame, thread_name: str) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+def sample_stacks(seconds: float, hz: int = 100) -> Counter:
+    """
+    Sample every other thread's stack `hz` times a second for `seconds` and
+    count identical stacks (root first, `;`-joined, thread name as the root).
+    One profile at a time; raises ProfilerBusy otherwise.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("a profile is already running")
+    try:
+        me = threading.get_ident()
+        interval = 1.0 / hz
+        counts: Counter = Counter()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    counts[_collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+            time.sleep(interval)
+        return counts
+    finally:
+        _profile_lock.release()
+
+def render_collapsed(counts: Counter) -> str:
+    """Brendan Gregg's folded format (`stack count` per line), for flamegraph.pl / speedscope."""
+    return "".join(f"{stack} {n}\n" for stack, n in sorted(counts.items()))
+
+def thread_stacks() -> List[Dict]:
+    frames = sys._current_frames()
+    out = []
+    for t in threading.enumerate():
+        frame = frames.get(t.ident)
+        out.append({
+            "name": t.name,
+            "ident": t.ident,
+            "daemon": t.daemon,
+            "stack": [f"{os.path.basename(fs.filename)}:{fs.lineno} {fs.name}" for fs in traceback.extract_stack(frame)]
+            if frame is not None else [],
+        })
+    return out
+
+def top_allocations(seconds: float, limit: int = 25) -> Dict:
+    """
+    Live allocations by source line. Starts tracemalloc for `seconds` (and stops
+    it again) unless it is already tracing, in which case it snapshots at once.
+    """
+    if not _alloc_lock.acquire(blocking=False):
+        raise ProfilerBusy("an allocation trace is already running")
+    try:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+            time.sleep(seconds)
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        stats = snapshot.statistics("lineno")
+        return {
+            "window_seconds": seconds if started else None,
+            "traced_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "top": [{
+                "file": s.traceback[0].filename,
+                "line": s.traceback[0].lineno,
+                "size_kb": round(s.size / 1024, 1),
+                "count": s.count,
+            } for s in stats[:limit]],
+        }
+    finally:
+        _alloc_lock.release()
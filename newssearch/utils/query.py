@@ -0,0 +1,66 @@
+from __future__ import annotations
+from typing import FrozenSet, Iterable, Optional
+
+# Guardian treats upper-case AND/OR/NOT as operators; once a query uses them, term order
+# and case are part of its meaning and must be kept.
+_OPERATORS = frozenset({"AND", "OR", "NOT"})
+
+DEFAULT_STOPWORDS: FrozenSet[str] = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "the", "to", "was", "with",
+})
+
+# words ending in -s/-ies that are not plurals (or whose singular is a different word)
+STEM_EXCEPTIONS: FrozenSet[str] = frozenset({
+    "news", "series", "species", "means", "chaos", "lens", "bias", "atlas", "canvas",
+    "physics", "politics", "economics", "athletics", "mathematics", "ethics", "olympics",
+    "diabetes", "measles", "herpes", "rabies", "crisis", "thesis", "analysis", "texas",
+    "paris", "wales", "brussels", "athens", "netherlands", "philippines", "mercedes",
+})
+
+def light_stem(term: str) -> str:
+    # plural-only stemmer for cache keys; the upstream query is never stemmed
+    if len(term) <= 3 or "-" in term or term in STEM_EXCEPTIONS:
+        return term
+    if term.endswith("ies") and len(term) > 4:
+        return term[:-3] + "y"
+    if term.endswith("sses"):
+        return term[:-2]
+    if term.endswith("s") and not term.endswith(("ss", "us", "is")):
+        return term[:-1]
+    return term
+
+class QueryCanonicalizer:
+    """
+    Maps equivalent spellings of a query to one canonical cache-key form:
+    case-folding, whitespace collapsing, sorted and de-duplicated terms
+    (bag-of-words queries only), plus optional plural stemming and stopword
+    removal. Stemming and stopwords are lossy, so they only apply to the key;
+    `upstream()` gives the lossless form that is sent to providers.
+    """
+    def __init__(self, stem: bool = False, stopwords: Optional[Iterable[str]] = None):
+        self._stem = stem
+        self._stopwords = frozenset(stopwords) if stopwords is not None else frozenset()
+
+    def __call__(self, query: str) -> str:
+        return _fold(query, self._stem, self._stopwords)
+
+    @staticmethod
+    def upstream(query: str) -> str:
+        """Case, whitespace and term order folded; every term kept as the user typed it."""
+        return _fold(query, False, frozenset())
+
+def _fold(query: str, stem: bool, stopwords: FrozenSet[str]) -> str:
+    terms = (query or "").split()
+    if not terms:
+        return ""
+    if any(t in _OPERATORS for t in terms):
+        return " ".join(t if t in _OPERATORS else t.casefold() for t in terms)
+
+    terms = [t.casefold() for t in terms]
+    kept = [t for t in terms if t not in stopwords] or terms  # never drop everything
+    if stem:
+        kept = [light_stem(t) for t in kept]
+    return " ".join(sorted(set(kept)))
+
+canonicalize = QueryCanonicalizer()
@@ -1,4 +1,3 @@
-import time
 import redis
 from newssearch.utils.logging_setup import configure_logging_from_env
 
@@ -20,18 +19,29 @@ class RateLimiter:
         self.rate = rate
         self.per_seconds = per_seconds
 
-    def allow(self, identity: str) -> bool:
+    def queue(self, pipe, identity: str, cost: int = 1) -> str:
         """
-        :param identity: per-user / per-IP identifier
-        :return: True if allowed, False if limited
+        Append this limiter's commands (INCR, EXPIRE) to `pipe` so callers can batch
+        them with other reads; returns the bucket key to pass to `check`.
+        `cost` lets one batched call count as several requests.
         """
         key = f"rl:{self.key_prefix}:{identity}"
-        now = int(time.time())
-        p = self.client.pipeline()
-        p.incr(key, 1)
-        p.expire(key, self.per_seconds)
-        count, _ = p.execute()
+        pipe.incr(key, cost)
+        pipe.expire(key, self.per_seconds)
+        return key
+
+    def check(self, key: str, count: int) -> bool:
         if count > self.rate:
             logger.error("rate_limit_exceeded key=%s count=%d", key, count)
             return False
         return True
+
+    def allow(self, identity: str) -> bool:
+        """
+        :param identity: per-user / per-IP identifier
+        :return: True if allowed, False if limited
+        """
+        p = self.client.pipeline()
+        key = self.queue(p, identity)
+        count, _ = p.execute()
+        return self.check(key, count)
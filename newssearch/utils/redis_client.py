@@ -0,0 +1,61 @@
+import redis
+from queue import Empty, LifoQueue
+from typing import List, Optional, Tuple, Union
+from newssearch.config import (
+    REDIS_MAX_CONNECTIONS, REDIS_HEALTH_CHECK_INTERVAL, REDIS_SOCKET_TIMEOUT, REDIS_REPLICAS,
+    REDIS_POOL_TIMEOUT, REDIS_NODE_FAILURES,
+)
+from newssearch.utils.sharding import ShardedRedis
+
+def parse_node(node: str, default_db: int = 0) -> Tuple[str, int, int]:
+    """"host:port[/db]" -> (host, port, db)."""
+    addr, _, db = node.partition("/")
+    host, sep, port = addr.partition(":")
+    return host or "localhost", int(port) if sep else 6379, int(db or default_db)
+
+def redis_client(
+    host: str, port: int, db: int, nodes: Optional[List[str]] = None,
+) -> Union[redis.StrictRedis, ShardedRedis]:
+    """
+    One bounded, health-checked connection pool per node per process; the cache,
+    the ingress limiter and the background writer all share the returned client.
+    With several `nodes`, returns a ShardedRedis router over them instead.
+    """
+    if nodes and len(nodes) > 1:
+        clients = {n: _single(*parse_node(n, db)) for n in nodes}
+        return ShardedRedis(clients, replicas=REDIS_REPLICAS, check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+                            fail_threshold=REDIS_NODE_FAILURES)
+    if nodes:
+        host, port, db = parse_node(nodes[0], db)
+    return _single(host, port, db)
+
+class _PoolQueue(LifoQueue):
+    # BlockingConnectionPool turns an empty wait into a plain ConnectionError("No connection
+    # available."); raising MaxConnectionsError here lets callers tell a saturated pool
+    # (backpressure) from a node that is actually unreachable
+    def get(self, block=True, timeout=None):
+        try:
+            return super().get(block, timeout)
+        except Empty:
+            raise redis.exceptions.MaxConnectionsError(f"no pooled connection free within {timeout}s") from None
+
+def _single(host: str, port: int, db: int) -> redis.StrictRedis:
+    client = redis.StrictRedis(
+        host=host, port=port, db=db, decode_responses=True,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+    )
+    # requests beyond REDIS_MAX_CONNECTIONS wait up to REDIS_POOL_TIMEOUT for a free
+    # connection instead of failing at once. The pool reuses the connection class and
+    # kwargs the client picked, so a patched client class (fakeredis in tests) keeps working.
+    default = client.connection_pool
+    client.connection_pool = redis.BlockingConnectionPool(
+        connection_class=default.connection_class,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        queue_class=_PoolQueue,
+        **default.connection_kwargs,
+    )
+    default.disconnect()
+    return client
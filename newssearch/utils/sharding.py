@@ -0,0 +1,300 @@
+from __future__ import annotations
+import bisect
+import hashlib
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import redis
+from newssearch.utils.logging_setup import configure_logging_from_env
+
+logger = configure_logging_from_env(__name__)
+
+_NODE_ERRORS = (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)
+# our own pool ran dry: the node is fine, this process is saturated
+_BACKPRESSURE = redis.exceptions.MaxConnectionsError
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+class HashRing:
+    """
+    Consistent-hash ring with virtual nodes. Removing a node only moves the keys
+    it owned (to the next node clockwise), so the rest of the cache stays warm.
+    """
+    def __init__(self, nodes: Sequence[str] = (), vnodes: int = 128):
+        self._vnodes = vnodes
+        # (sorted points, owner per point, node list) swapped as one tuple so
+        # lookups on other threads never see a half-updated ring
+        self._state: Tuple[List[int], List[str], List[str]] = ([], [], [])
+        for n in nodes:
+            self.add(n)
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._state[2])
+
+    def add(self, node: str) -> None:
+        points, owners, nodes = self._state
+        if node in nodes:
+            return
+        ring = sorted(list(zip(points, owners)) + [(_hash(f"{node}#{i}"), node) for i in range(self._vnodes)])
+        self._state = ([p for p, _ in ring], [o for _, o in ring], nodes + [node])
+
+    def remove(self, node: str) -> None:
+        points, owners, nodes = self._state
+        if node not in nodes:
+            return
+        keep = [(p, o) for p, o in zip(points, owners) if o != node]
+        self._state = ([p for p, _ in keep], [o for _, o in keep], [n for n in nodes if n != node])
+
+    def nodes_for(self, key: str, n: int = 1) -> List[str]:
+        """The first `n` distinct nodes clockwise from `key`: primary, then replicas."""
+        points, owners, nodes = self._state
+        if not points:
+            return []
+        n = min(n, len(nodes))
+        out: List[str] = []
+        i = bisect.bisect(points, _hash(key)) % len(points)
+        while len(out) < n:
+            if owners[i] not in out:
+                out.append(owners[i])
+            i = (i + 1) % len(points)
+        return out
+
+class ShardedRedis:
+    """
+    Client-side sharding over several Redis nodes, exposing the subset of the
+    redis-py client API that RedisCache, BackgroundWriter and RateLimiter use.
+
+    - Cache keys are written to `replicas` consecutive ring nodes and reads are
+      spread across them; while a node is down, reads go to the first surviving
+      replica, which already holds the key.
+    - Counter keys (`counter_prefixes`, the rate limiter's "rl:") live on their
+      primary only, and a pipeline sends each node its commands as one
+      MULTI/EXEC, so a bucket's INCR+EXPIRE stay atomic on one node.
+    - A connection/timeout error only drops a node from the ring (its keys rehash
+      to the next nodes, and its "rl:" counters start over there) when a ping to it
+      fails too, or after `fail_threshold` consecutive failed calls; one slow reply
+      is not an outage. Commands bound for a dropped node are retried once on the
+      new ring; otherwise the error reaches the caller.
+    - An exhausted local connection pool (MaxConnectionsError) is backpressure, not
+      a node failure: it is raised to the caller and never drops the node.
+    - A daemon thread pings dropped nodes every `check_interval` seconds and adds
+      them back; entries they hold from before the outage are only as stale as
+      their TTL.
+    """
+    def __init__(
+        self,
+        clients: Dict[str, redis.StrictRedis],  # node name ("host:port/db") -> client
+        replicas: int = 2,
+        vnodes: int = 128,
+        check_interval: float = 30,
+        counter_prefixes: Tuple[str, ...] = ("rl:",),
+        fail_threshold: int = 3,
+    ):
+        self._clients = clients
+        self._replicas = max(1, replicas)
+        self._counters = counter_prefixes
+        self._ring = HashRing(list(clients), vnodes)
+        self._down: List[str] = []
+        self._failures: Dict[str, int] = {}  # node -> consecutive failed calls
+        self._fail_threshold = max(1, fail_threshold)
+        self._lock = threading.Lock()
+        self._interval = check_interval
+        self._reviver: Optional[threading.Thread] = None
+
+    # ----- routing -----
+    @property
+    def healthy_nodes(self) -> List[str]:
+        return self._ring.nodes
+
+    def client_for(self, node: str) -> redis.StrictRedis:
+        return self._clients[node]
+
+    def _write_nodes(self, key: str) -> List[str]:
+        n = 1 if key.startswith(self._counters) else self._replicas
+        nodes = self._ring.nodes_for(key, n)
+        if not nodes:
+            raise redis.exceptions.ConnectionError("no healthy redis nodes")
+        return nodes
+
+    def _read_node(self, key: str) -> str:
+        nodes = self._write_nodes(key)
+        if len(nodes) == 1 or self._down:
+            # while a node is out, only the first surviving replica is sure to hold the key
+            return nodes[0]
+        return random.choice(nodes)
+
+    def record_failure(self, node: str, err: Exception) -> bool:
+        """Count a failed call on `node`; returns True if the node was dropped."""
+        with self._lock:
+            n = self._failures[node] = self._failures.get(node, 0) + 1
+        if n < self._fail_threshold:
+            try:
+                self._clients[node].ping()
+            except _BACKPRESSURE:
+                return False
+            except Exception as e:
+                err = e
+            else:
+                logger.warning("redis_node_error node=%s consecutive=%d err=%s", node, n, err)
+                return False
+        self.mark_down(node, err)
+        return True
+
+    def record_success(self, node: str) -> None:
+        if self._failures.get(node):
+            with self._lock:
+                self._failures.pop(node, None)
+
+    def mark_down(self, node: str, err: Exception) -> None:
+        with self._lock:
+            if node in self._down:
+                return
+            self._ring.remove(node)
+            self._down.append(node)
+            logger.error("redis_node_down node=%s healthy=%d err=%s", node, len(self._ring.nodes), err)
+            if self._reviver is None:
+                self._reviver = threading.Thread(target=self._revive_loop, name="redis-reviver", daemon=True)
+                self._reviver.start()
+
+    def revive(self) -> List[str]:
+        """Ping dropped nodes once; the ones that answer go back on the ring."""
+        back = []
+        for node in list(self._down):
+            try:
+                self._clients[node].ping()
+            except Exception:
+                continue
+            with self._lock:
+                self._down.remove(node)
+                self._failures.pop(node, None)
+                self._ring.add(node)
+            back.append(node)
+            logger.info("redis_node_up node=%s healthy=%d", node, len(self._ring.nodes))
+        return back
+
+    def _revive_loop(self) -> None:
+        while True:
+            time.sleep(self._interval)
+            if self._down:
+                self.revive()
+
+    # ----- commands (each is a one-command pipeline) -----
+    def pipeline(self, transaction: bool = True) -> "ShardedPipeline":
+        return ShardedPipeline(self, transaction)
+
+    def _one(self, name: str, *args: Any) -> Any:
+        p = self.pipeline(transaction=False)
+        getattr(p, name)(*args)
+        return p.execute()[0]
+
+    def get(self, key: str) -> Any:
+        return self._one("get", key)
+
+    def mget(self, keys: List[str]) -> List[Any]:
+        return self._one("mget", keys)
+
+    def setex(self, key: str, ttl: int, value: Any) -> Any:
+        return self._one("setex", key, ttl, value)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        return self._one("incr", key, amount)
+
+    def expire(self, key: str, seconds: int) -> Any:
+        return self._one("expire", key, seconds)
+
+    def ttl(self, key: str) -> int:
+        return self._one("ttl", key)
+
+    def delete(self, *keys: str) -> int:
+        return sum(self._one("delete", k) for k in keys)
+
+    def ping(self) -> bool:
+        return bool(self._ring.nodes) and all(self._clients[n].ping() for n in self._ring.nodes)
+
+_WRITES = {"setex", "incr", "expire", "delete"}
+
+class ShardedPipeline:
+    """
+    Buffers commands, then runs one redis-py pipeline per node and reassembles
+    the replies in call order. MGET is split by node. Commands bound for a node
+    that gets dropped are re-planned once on the ring without it.
+    """
+    def __init__(self, router: ShardedRedis, transaction: bool = True):
+        self._router = router
+        self._transaction = transaction
+        self._ops: List[Tuple[str, tuple]] = []
+
+    def _queue(self, name: str, *args: Any) -> "ShardedPipeline":
+        self._ops.append((name, args))
+        return self
+
+    def get(self, key: str): return self._queue("get", key)
+    def mget(self, keys: List[str]): return self._queue("mget", list(keys))
+    def setex(self, key: str, ttl: int, value: Any): return self._queue("setex", key, ttl, value)
+    def incr(self, key: str, amount: int = 1): return self._queue("incr", key, amount)
+    def expire(self, key: str, seconds: int): return self._queue("expire", key, seconds)
+    def ttl(self, key: str): return self._queue("ttl", key)
+    def delete(self, key: str): return self._queue("delete", key)
+
+    def _plan(self, pending: List[int]) -> Dict[str, List[Tuple[int, Optional[List[int]], str, tuple, bool]]]:
+        # node -> [(op index, mget positions, command, args, reply counts)]
+        calls: Dict[str, list] = {}
+        r = self._router
+        for i in pending:
+            name, args = self._ops[i]
+            if name == "mget":
+                groups: Dict[str, List[int]] = {}
+                for pos, k in enumerate(args[0]):
+                    groups.setdefault(r._read_node(k), []).append(pos)
+                for node, positions in groups.items():
+                    calls.setdefault(node, []).append((i, positions, name, ([args[0][p] for p in positions],), True))
+            elif name in _WRITES:
+                for j, node in enumerate(r._write_nodes(args[0])):
+                    calls.setdefault(node, []).append((i, None, name, args, j == 0))
+            else:
+                calls.setdefault(r._read_node(args[0]), []).append((i, None, name, args, True))
+        return calls
+
+    def execute(self) -> List[Any]:
+        results: List[Any] = [None] * len(self._ops)
+        for i, (name, args) in enumerate(self._ops):
+            if name == "mget":
+                results[i] = [None] * len(args[0])
+        pending = list(range(len(self._ops)))
+        for attempt in range(2):
+            failed: List[int] = []
+            for node, calls in self._plan(pending).items():
+                pipe = self._router.client_for(node).pipeline(transaction=self._transaction)
+                for _, _, name, args, _ in calls:
+                    getattr(pipe, name)(*args)
+                try:
+                    replies = pipe.execute()
+                except _BACKPRESSURE:
+                    raise
+                except _NODE_ERRORS as e:
+                    if not self._router.record_failure(node, e):
+                        if any(counts for *_, counts in calls):
+                            raise
+                        continue  # only replica writes were lost; their primaries answered
+                    failed.extend(i for i, _, _, _, counts in calls if counts)
+                    continue
+                self._router.record_success(node)
+                for (i, positions, _, _, counts), reply in zip(calls, replies):
+                    if not counts:
+                        continue
+                    if positions is None:
+                        results[i] = reply
+                    else:
+                        for p, v in zip(positions, reply):
+                            results[i][p] = v
+            if not failed:
+                break
+            # a failed replica write is not retried; its primary already answered
+            pending = sorted(set(failed))
+            if attempt == 1:
+                raise redis.exceptions.ConnectionError(f"redis nodes failed for {len(pending)} commands")
+        return results
@@ -0,0 +1,193 @@
+from __future__ import annotations
+import bisect
+import heapq
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from newssearch.utils.query import DEFAULT_STOPWORDS
+
+_WORD_RE = re.compile(r"\w+")
+_SPACE_RE = re.compile(r"\s+")
+
+def normalize_phrase(text: str) -> str:
+    return _SPACE_RE.sub(" ", (text or "").casefold()).strip()
+
+class SuggestIndex:
+    """
+    In-memory prefix index for /suggest: phrases in a sorted array (binary search
+    for the prefix range) ranked by an exponentially decayed frequency.
+
+    - Decay uses forward decay: a hit at time t adds 2**((t - t0) / half_life), so
+      stored scores never need a decay pass and compare correctly at any moment.
+      When the exponent grows large, every score is rescaled once and t0 moves.
+    - New phrases go to a small sorted side array, so inserts are cheap and
+      lookups search both arrays. The side array is merged into the main one when
+      it reaches `merge_every`, and the lowest-scored phrases are trimmed to
+      `max_phrases` at that point.
+    - Phrases come from searched queries (weight 1) and from words/bigrams of
+      article titles (`title_weight`). A phrase whose `canonicalize` form (the
+      page-cache key the search path uses) was searched within `cache_ttl` is
+      flagged `cached`, and that flag boosts its rank, which steers type-ahead
+      onto pages already in Redis.
+    - One- and two-character prefixes match a large slice of the index, so their
+      results are memoized for `memo_seconds`.
+    """
+    def __init__(
+        self,
+        half_life_seconds: float = 6 * 3600,
+        max_phrases: int = 50000,
+        title_weight: float = 0.25,
+        cache_ttl: float = 300,
+        cached_boost: float = 2.0,
+        merge_every: int = 512,
+        memo_seconds: float = 1.0,
+        now_fn: Callable[[], float] = time.time,
+        canonicalize: Callable[[str], str] = normalize_phrase,
+    ):
+        self._half_life = half_life_seconds
+        self._max = max_phrases
+        self._title_weight = title_weight
+        self._cache_ttl = cache_ttl
+        self._boost = cached_boost
+        self._merge_every = merge_every
+        self._now = now_fn
+        self._canon = canonicalize
+        self._memo_seconds = memo_seconds
+        self._memo: Dict[Tuple[str, int], Tuple[float, List[Tuple[str, float, bool]]]] = {}
+        self._lock = threading.Lock()
+        self._t0 = now_fn()
+        self._scores: Dict[str, float] = {}
+        self._searched: Dict[str, float] = {}   # canonical key -> last time it was searched
+        self._keys: Dict[str, str] = {}         # phrase -> canonical key, only where they differ
+        # readers take these references without the lock; writers swap, never mutate
+        self._main: List[str] = []
+        self._side: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    # ----- building -----
+    def _weight(self, now: float) -> float:
+        # caller holds the lock; rescale before 2**x gets anywhere near float overflow
+        x = (now - self._t0) / self._half_life
+        if x > 32:
+            self._rescale(now)
+            x = 0.0
+        return 2.0 ** x
+
+    def _add(self, phrases: Iterable[str], weight: float) -> None:
+        # caller holds the lock; new phrases land in the side array in one swap
+        scores, keys, canon = self._scores, self._keys, self._canon
+        new = []
+        for phrase in phrases:
+            if phrase in scores:
+                scores[phrase] += weight
+            else:
+                scores[phrase] = weight
+                new.append(phrase)
+                key = canon(phrase)
+                if key != phrase:
+                    keys[phrase] = key
+        if new:
+            self._side = sorted(self._side + new)
+            if len(self._side) >= self._merge_every:
+                self._merge()
+
+    def _merge(self) -> None:
+        phrases = self._scores
+        if len(phrases) > self._max:
+            keep = set(heapq.nlargest(self._max, phrases, key=phrases.__getitem__))
+            for p in [p for p in phrases if p not in keep]:
+                del phrases[p]
+                self._keys.pop(p, None)
+            self._main = sorted(keep)
+            self._prune_searched(self._now())
+        else:
+            self._main = list(heapq.merge(self._main, self._side))
+        self._side = []
+
+    def _prune_searched(self, now: float) -> None:
+        # only searches within cache_ttl flag anything, so older entries are dead weight
+        fresh = now - self._cache_ttl
+        self._searched = {k: t for k, t in self._searched.items() if t > fresh}
+
+    def _rescale(self, now: float) -> None:
+        factor = 2.0 ** (-(now - self._t0) / self._half_life)
+        self._scores = {p: s * factor for p, s in self._scores.items() if s * factor > 1e-9}
+        self._t0 = now
+        self._keys = {p: k for p, k in self._keys.items() if p in self._scores}
+        self._prune_searched(now)
+        self._main = [p for p in self._main if p in self._scores]
+        self._side = [p for p in self._side if p in self._scores]
+
+    def record_query(self, query: str) -> None:
+        phrase = normalize_phrase(query)
+        if not phrase:
+            return
+        key = self._canon(query)  # what the page cache was keyed by
+        now = self._now()
+        with self._lock:
+            self._add((phrase,), self._weight(now))
+            self._searched[key] = now
+
+    def record_titles(self, titles: Iterable[Optional[str]]) -> None:
+        now = self._now()
+        phrases = []
+        for title in titles:
+            words = [t for t in _WORD_RE.findall((title or "").casefold())
+                     if len(t) > 2 and t not in DEFAULT_STOPWORDS]
+            phrases += words
+            phrases += [f"{a} {b}" for a, b in zip(words, words[1:])]
+        if not phrases:
+            return
+        with self._lock:
+            self._add(phrases, self._weight(now) * self._title_weight)
+
+    def flush(self) -> None:
+        """Merge pending phrases now (tests/benchmarks; normally amortized)."""
+        with self._lock:
+            self._merge()
+
+    # ----- lookup -----
+    @staticmethod
+    def _range(arr: List[str], prefix: str) -> List[str]:
+        lo = bisect.bisect_left(arr, prefix)
+        hi = bisect.bisect_left(arr, prefix + "\U0010ffff", lo)
+        return arr[lo:hi]
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Tuple[str, float, bool]]:
+        """Top `limit` phrases starting with `prefix` as (phrase, decayed score, cached)."""
+        prefix = normalize_phrase(prefix)
+        if not prefix:
+            return []
+        now = self._now()
+        if len(prefix) <= 2:
+            hit = self._memo.get((prefix, limit))
+            if hit and hit[0] > now:
+                return hit[1]
+            out = self._lookup(prefix, limit, now)
+            if len(self._memo) > 4096:
+                self._memo = {}
+            self._memo[(prefix, limit)] = (now + self._memo_seconds, out)
+            return out
+        return self._lookup(prefix, limit, now)
+
+    def _lookup(self, prefix: str, limit: int, now: float) -> List[Tuple[str, float, bool]]:
+        main, side, scores, searched, keys = self._main, self._side, self._scores, self._searched, self._keys
+        fresh = now - self._cache_ttl
+        boost = self._boost
+
+        def is_cached(p: str) -> bool:
+            return searched.get(keys.get(p, p), 0.0) > fresh
+
+        def rank(p: str) -> float:
+            s = scores.get(p, 0.0)
+            return s * boost if is_cached(p) else s
+
+        candidates = self._range(main, prefix) + self._range(side, prefix)
+        top = heapq.nlargest(limit, candidates, key=rank)
+        scale = 2.0 ** (-(now - self._t0) / self._half_life)
+        return [(p, round(scores.get(p, 0.0) * scale, 4), is_cached(p))
+                for p in top if p in scores]
@@ -1,24 +1,21 @@
-import re
-def canon(url: str) -> str:
-    # Remove protocol, www, trailing slashes, and lowercase
-    url = url.strip().lower()
-    url = re.sub(r'^https?://(www\.)?', '', url)
-    url = url.rstrip('/')
-    return url
+# canon/parse_published_at/EPOCH live with Article, which computes them per item;
+# they are re-exported here for existing importers
+from newssearch.utils.article import EPOCH, Article, canon, parse_published_at  # noqa: F401
+
 def normalize_guardian(data):
     resp = data.get("response", {})
     results = resp.get("results", [])
     total = int(resp.get("total", len(results)))
     norm = []
     for it in results:
-        norm.append({
-            "source": "guardian",
-            "title": it.get("webTitle"),
-            "description": ((it.get("fields") or {}).get("trailText") or ""),
-            "url": it.get("webUrl"),
-            "published_at": it.get("webPublicationDate"),
-            "website": "The Guardian",
-        })
+        norm.append(Article(
+            "guardian",
+            it.get("webTitle"),
+            ((it.get("fields") or {}).get("trailText") or ""),
+            it.get("webUrl"),
+            it.get("webPublicationDate"),
+            "The Guardian",
+        ))
     return {"items": norm, "total": total}
 
 def normalize_nyt(data, page_size):
@@ -28,12 +25,12 @@ def normalize_nyt(data, page_size):
     total = int(meta.get("hits", len(docs)))
     norm = []
     for d in docs[:page_size]:
-        norm.append({
-            "source": "nytimes",
-            "title": (d.get("headline") or {}).get("main"),
-            "description": (d.get("abstract") or "")[:280],
-            "url": d.get("web_url"),
-            "published_at": d.get("pub_date"),
-            "website": "The New York Times",
-        })
+        norm.append(Article(
+            "nytimes",
+            (d.get("headline") or {}).get("main"),
+            (d.get("abstract") or "")[:280],
+            d.get("web_url"),
+            d.get("pub_date"),
+            "The New York Times",
+        ))
     return {"items": norm, "total": total}
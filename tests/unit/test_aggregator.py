@@ -0,0 +1,192 @@
+import threading
+import time
+import fakeredis
+from newssearch.services.aggregator import Aggregator, SearchSpec
+from newssearch.utils.article import Article
+from newssearch.utils.cache import RedisCache
+from newssearch.utils.strategies import CanonUrlDedupe, HeapMergeSort, RelevanceSort
+
+class FakeProvider:
+    def __init__(self, name, items, degraded=False):
+        self.name, self.items, self.degraded, self.calls = name, items, degraded, 0
+    def fetch(self, query, page, page_size, offline):
+        self.calls += 1
+        out = {"items": self.items, "total": len(self.items)}
+        if self.degraded:
+            out["degraded"] = True
+        return out
+
+def _cache():
+    c = RedisCache("localhost", 6379, 0)
+    c._client = fakeredis.FakeStrictRedis(decode_responses=True)
+    return c
+
+def _agg(providers, cache):
+    return Aggregator(providers, cache, CanonUrlDedupe(), HeapMergeSort(), 300,
+                      {"relevance": RelevanceSort()}, provider_ttls={"nyt": 600}, negative_ttl=30)
+
+def test_provider_results_cached_independently_of_merged_page():
+    g = FakeProvider("guardian", [{"url": "https://g/1", "published_at": "2025-08-08T10:00:00Z"}])
+    n = FakeProvider("nyt", [{"url": "https://n/1", "published_at": "2025-08-08T11:00:00+0000"}])
+    agg = _agg([g, n], _cache())
+    first = agg.aggregate("apple", 1, 10, False, "date")
+    agg.aggregate("apple", 1, 10, False, "relevance")  # new merged key, same provider entries
+    assert [it["url"] for it in first["items"]] == ["https://n/1", "https://g/1"]
+    assert (g.calls, n.calls) == (1, 1)
+
+def test_degraded_provider_gets_negative_ttl_and_is_refetched_alone():
+    cache = _cache()
+    g = FakeProvider("guardian", [{"url": "https://g/1"}])
+    n = FakeProvider("nyt", [{"url": "https://n/offline"}], degraded=True)
+    agg = _agg([g, n], cache)
+    agg.aggregate("apple", 1, 10, False)
+    r = cache._client
+    assert r.ttl("prov:nyt:apple:1:10:False") <= 30
+    assert r.ttl("prov:guardian:apple:1:10:False") > 30
+    assert r.ttl("agg:apple:1:10:False:date") <= 30
+
+    r.delete("prov:nyt:apple:1:10:False", "agg:apple:1:10:False:date")  # negative entry expires
+    agg.aggregate("apple", 1, 10, False)
+    assert (g.calls, n.calls) == (1, 2)
+
+class PagedProvider:
+    def __init__(self, name, items):
+        self.name, self.items, self.pages = name, items, []
+    def fetch(self, query, page, page_size, offline):
+        self.pages.append(page)
+        start = (page - 1) * page_size
+        return {"items": self.items[start:start + page_size], "total": len(self.items)}
+
+def _stream(host, hours):
+    return [{"url": f"https://{host}/{h}", "published_at": f"2025-08-08T{h:02d}:00:00Z"} for h in hours]
+
+def _walk(agg, page_size):
+    pos, urls = None, []
+    while True:
+        out = agg.aggregate_cursor("apple", page_size, False, pos, cursor=str(pos))
+        urls += [it["url"] for it in out["items"]]
+        if not out["next"]:
+            return urls
+        pos = out["next"]
+
+def test_cursor_walk_matches_full_sort_and_reads_each_provider_page_once():
+    g = PagedProvider("guardian", _stream("g", range(23, 10, -2)))
+    n = PagedProvider("nyt", _stream("n", range(22, 9, -2)))
+    agg = _agg([g, n], _cache())
+    urls = _walk(agg, 3)
+    expected = [it["url"] for it in sorted(g.items + n.items, key=lambda d: d["published_at"], reverse=True)]
+    assert urls == expected
+    assert sorted(set(g.pages)) == g.pages and sorted(set(n.pages)) == n.pages
+
+def test_cursor_resumes_by_keyset_when_new_articles_arrive():
+    g = PagedProvider("guardian", _stream("g", [20, 18, 16, 14]))
+    agg = _agg([g], _cache())
+    first = agg.aggregate_cursor("apple", 2, False)
+    g.items[:0] = _stream("g", [23, 22])  # two newer stories shift every page
+    agg._cache._client.flushall()
+    second = agg.aggregate_cursor("apple", 2, False, first["next"], cursor="c1")
+    assert [it["url"] for it in first["items"]] == ["https://g/20", "https://g/18"]
+    assert [it["url"] for it in second["items"]] == ["https://g/16", "https://g/14"]
+
+class SlowProvider(FakeProvider):
+    def __init__(self, name, items, delay=0.05):
+        super().__init__(name, items)
+        self.delay, self.active, self.peak = delay, 0, 0
+        self._lock = threading.Lock()
+    def fetch(self, query, page, page_size, offline):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return super().fetch(query, page, page_size, offline)
+
+def test_aggregate_many_shares_provider_fetches_and_budget():
+    g = SlowProvider("guardian", [{"url": "https://g/1", "published_at": "2025-08-08T10:00:00Z"}])
+    agg = Aggregator([g], _cache(), CanonUrlDedupe(), HeapMergeSort(), 300, {"relevance": RelevanceSort()},
+                     provider_concurrency=2)
+    specs = [SearchSpec(q, 1, 10, False, sort) for q in ("a", "b", "c", "d") for sort in ("date", "relevance")]
+    out = dict(agg.aggregate_many(specs))
+    assert sorted(out) == list(range(8))
+    assert all(o["items"][0]["url"] == "https://g/1" for o in out.values())
+    assert g.calls == 4   # date + relevance pages share the provider entry
+    assert g.peak == 2    # fetched concurrently, within the provider budget
+
+def test_offset_pages_merge_provider_pages_up_to_the_requested_page():
+    g = PagedProvider("guardian", _stream("g", range(23, 7, -2)))
+    n = PagedProvider("nyt", _stream("n", range(22, 6, -2)))
+    agg = _agg([g, n], _cache())
+    expected = [it["url"] for it in sorted(g.items + n.items, key=lambda d: d["published_at"], reverse=True)]
+    for sort in ("date", "relevance"):
+        seen = []
+        for page in range(1, 9):
+            urls = [it["url"] for it in agg.aggregate("apple", page, 2, False, sort)["items"]]
+            assert len(urls) == 2 and not set(urls) & set(seen), (sort, page)
+            seen += urls
+        assert sorted(seen) == sorted(expected)
+        if sort == "date":
+            assert seen == expected
+
+def test_offset_pages_stop_at_max_offset_pages():
+    g = PagedProvider("guardian", _stream("g", range(23, 0, -1)))
+    agg = Aggregator([g], _cache(), CanonUrlDedupe(), HeapMergeSort(), 300, max_offset_pages=3)
+    assert agg.aggregate("apple", 3, 2, False)["total_estimated_pages"] == 3
+    assert agg.aggregate("apple", 4, 2, False)["items"] == []
+    assert max(g.pages) == 3
+
+class StalledProvider(FakeProvider):
+    def __init__(self, name, items):
+        super().__init__(name, items)
+        self.release = threading.Event()
+    def fetch(self, query, page, page_size, offline):
+        self.release.wait(5)
+        return super().fetch(query, page, page_size, offline)
+
+def test_stalled_provider_does_not_starve_the_others():
+    stalled = StalledProvider("guardian", [{"url": "https://g/1", "published_at": "2025-08-08T10:00:00Z"}])
+    fast = FakeProvider("nyt", [{"url": "https://n/1", "published_at": "2025-08-08T11:00:00Z"}])
+    agg = Aggregator([stalled, fast], _cache(), CanonUrlDedupe(), HeapMergeSort(), 300, provider_concurrency=2)
+    threads = [threading.Thread(target=agg.aggregate, args=(f"q{i}", 1, 10, False)) for i in range(12)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 2
+    while fast.calls < 12 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    try:
+        assert fast.calls == 12 and stalled.calls == 0
+    finally:
+        stalled.release.set()
+        for t in threads:
+            t.join()
+    assert stalled.calls == 12
+
+class FixedPageProvider(PagedProvider):
+    native_page_size = 5  # ignores the requested page_size, like NYT's fixed 10
+    def fetch(self, query, page, page_size, offline):
+        assert page_size == self.native_page_size
+        return super().fetch(query, page, page_size, offline)
+
+def test_native_page_size_is_not_truncated_or_cut_short():
+    g = PagedProvider("guardian", _stream("g", range(23, 10, -2)))
+    n = FixedPageProvider("nyt", _stream("n", range(22, 0, -1)))
+    expected = [it["url"] for it in sorted(g.items + n.items, key=lambda d: d["published_at"], reverse=True)]
+    for ps in (2, 7):
+        assert _walk(_agg([g, n], _cache()), ps) == expected
+        agg = _agg([g, n], _cache())
+        pages = [agg.aggregate("apple", page, ps, False)["items"] for page in range(1, -(-len(expected) // ps) + 1)]
+        assert [it["url"] for items in pages for it in items] == expected
+
+def test_stale_cursor_walk_is_capped_per_request():
+    g = PagedProvider("guardian", _stream("g", range(23, 0, -1)))
+    agg = Aggregator([g], _cache(), CanonUrlDedupe(), HeapMergeSort(), 300, max_walk_pages=2)
+    # written when g/5 was second on page 1; 18 newer stories have arrived since
+    g5 = Article.from_dict(g.items[-5])
+    stale = {"guardian": [1, 2, g5.ts, g5.canon_url, 2]}
+    out = agg.aggregate_cursor("apple", 2, False, stale, cursor="stale")
+    assert out["items"] == [] and out["partial"] and g.pages == [1, 2, 3]
+    urls = []
+    while out["next"]:
+        out = agg.aggregate_cursor("apple", 2, False, out["next"], cursor=str(out["next"]))
+        urls += [it["url"] for it in out["items"]]
+    assert urls == ["https://g/4", "https://g/3", "https://g/2", "https://g/1"]
@@ -0,0 +1,28 @@
+import json
+from newssearch.utils.article import Article, to_json
+from newssearch.utils.validation import normalize_guardian, normalize_nyt
+
+def test_normalizers_build_interned_articles_with_derived_fields():
+    g = normalize_guardian({"response": {"results": [
+        {"webTitle": "t", "webUrl": "https://www.theguardian.com/x/", "webPublicationDate": "2025-08-08T10:00:00Z"},
+    ]}})["items"][0]
+    n = normalize_nyt({"response": {"docs": [
+        {"headline": {"main": "t"}, "web_url": "https://www.nytimes.com/y", "pub_date": "2025-08-08T10:00:00+0000"},
+    ]}}, 10)["items"][0]
+    assert isinstance(g, Article) and g.canon_url == "theguardian.com/x"
+    assert g.ts == n.ts  # "Z" and "+0000" parse to the same instant
+    other = Article("guardian", "u", "", "https://a", None, "The Guardian")
+    assert g.website is other.website and g.source is other.source
+
+def test_article_round_trips_through_json():
+    a = Article("nytimes", "Title", "desc", "https://www.nytimes.com/a", "2025-08-08T09:00:00Z", "The New York Times")
+    raw = json.dumps({"items": [a]}, default=to_json)
+    back = Article.from_dict(json.loads(raw)["items"][0])
+    assert back == a and back["url"] == a.get("url")
+    assert not hasattr(a, "__dict__")
+
+def test_token_sets_are_memoized_on_the_article():
+    a = Article("guardian", "Apple's new iPhone", None, "https://g/1", None, "The Guardian")
+    assert a.title_tokens == {"apple", "s", "new", "iphone"} and a.desc_tokens == frozenset()
+    assert a.title_tokens is a.title_tokens
+    assert Article("nyt", None, "", "https://n/1", None, "").title_tokens == frozenset()
@@ -0,0 +1,60 @@
+import fakeredis
+import pytest
+from newssearch.utils.cache import BackgroundWriter, CacheBusy, RedisCache
+from newssearch.utils.rate_limit import RateLimiter
+
+def _shared():
+    r = fakeredis.FakeStrictRedis(decode_responses=True)
+    return r, RedisCache("localhost", 6379, 0, client=r)
+
+def test_rate_limit_and_cache_read_share_one_pipeline():
+    r, cache = _shared()
+    limiter = RateLimiter(r, "ingress", rate=2, per_seconds=60)
+    cache.set_json("agg:k", {"items": [1]}, 60)
+
+    assert cache.get_json_rate_limited(limiter, "user", "agg:k") == (True, {"items": [1]})
+    assert cache.get_json_rate_limited(limiter, "user", "agg:miss") == (True, None)
+    assert cache.get_json_rate_limited(limiter, "user", "agg:k") == (False, None)
+
+def test_background_writer_writes_async_with_ttl():
+    r = fakeredis.FakeStrictRedis(decode_responses=True)
+    writer = BackgroundWriter(r, max_queue=10)
+    cache = RedisCache("localhost", 6379, 0, client=r, writer=writer)
+    cache.set_json("k", {"a": 1}, 30)
+    writer.flush()
+    assert cache.get_json("k") == {"a": 1}
+    assert 0 < r.ttl("k") <= 30
+
+def test_batch_read_charges_cost_in_one_pipeline():
+    r, cache = _shared()
+    limiter = RateLimiter(r, "ingress", rate=5, per_seconds=60)
+    cache.set_json("agg:a", {"items": [1]}, 60)
+
+    assert cache.get_many_json_rate_limited(limiter, "user", ["agg:a", "agg:b"], cost=3) == \
+        (True, [{"items": [1]}, None])
+    assert cache.get_many_json_rate_limited(limiter, "user", ["agg:a"], cost=3) == (False, [None])
+
+def test_pool_exhaustion_raises_instead_of_failing_open():
+    import redis
+    r, cache = _shared()
+    limiter = RateLimiter(r, "ingress", rate=5, per_seconds=60)
+    class Saturated:
+        def pipeline(self, *a, **k): raise redis.exceptions.MaxConnectionsError("no pooled connection free")
+    cache._client = Saturated()
+    with pytest.raises(CacheBusy):
+        cache.get_json_rate_limited(limiter, "user", "agg:k")
+
+def test_redis_client_waits_on_a_bounded_pool(monkeypatch):
+    import redis
+    from newssearch.utils import redis_client as rc
+    monkeypatch.setattr(rc, "REDIS_MAX_CONNECTIONS", 1)
+    monkeypatch.setattr(rc, "REDIS_POOL_TIMEOUT", 0.05)
+    client = rc.redis_client("localhost", 6379, 0)
+    assert isinstance(client.connection_pool, redis.BlockingConnectionPool)
+    client.set("k", "v")
+    assert client.get("k") == "v"
+    held = client.connection_pool.get_connection()
+    with pytest.raises(redis.exceptions.MaxConnectionsError):
+        client.get("k")
+    client.connection_pool.release(held)
+    assert client.get("k") == "v"
@@ -0,0 +1,47 @@
+import threading
+import time
+import pytest
+from newssearch.utils.circuit_breaker import CircuitBreaker, CircuitOpen
+
+def test_breaker_does_not_serialize_concurrent_calls():
+    breaker = CircuitBreaker(fail_max=2, reset_timeout=60)
+    active, peak, lock = [0], [0], threading.Lock()
+    def slow():
+        with lock:
+            active[0] += 1; peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+    threads = [threading.Thread(target=breaker.call, args=(slow,)) for _ in range(3)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert peak[0] == 3
+
+    def boom(): raise ValueError("upstream down")
+    for _ in range(2):
+        try: breaker.call(boom)
+        except ValueError: pass
+    assert breaker.current_state == "open"
+
+def test_breaker_half_open_allows_one_trial_call():
+    now = [0.0]
+    breaker = CircuitBreaker(fail_max=1, reset_timeout=10, now_fn=lambda: now[0])
+    with pytest.raises(ValueError):
+        breaker.call(lambda: (_ for _ in ()).throw(ValueError("down")))
+    with pytest.raises(CircuitOpen):
+        breaker.call(lambda: "not called")
+
+    now[0] = 10.0
+    calls, started, release = [0], threading.Event(), threading.Event()
+    def trial():
+        calls[0] += 1
+        started.set(); release.wait(2)
+        return "ok"
+    t = threading.Thread(target=breaker.call, args=(trial,))
+    t.start(); started.wait(2)
+    assert breaker.current_state == "half-open"
+    with pytest.raises(CircuitOpen):
+        breaker.call(trial)  # a second caller does not get a trial of its own
+    release.set(); t.join()
+    assert calls[0] == 1
+    assert breaker.current_state == "closed"
@@ -0,0 +1,20 @@
+import pytest
+from newssearch.utils.cursor import InvalidCursor, decode_cursor, encode_cursor
+
+def test_cursor_round_trip():
+    state = {"q": "apple", "ps": 10, "pos": {"nyt": [2, 3, 1754650800.0, "nytimes.com/x"]}}
+    assert decode_cursor(encode_cursor(state, "s3cret"), "s3cret") == state
+
+@pytest.mark.parametrize("token", ["", "abc", "abc.def", "!!.??"])
+def test_malformed_cursor_rejected(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "s3cret")
+
+def test_tampered_or_foreign_cursor_rejected():
+    token = encode_cursor({"q": "apple"}, "s3cret")
+    payload, sig = token.split(".")
+    forged = encode_cursor({"q": "banana"}, "s3cret").split(".")[0]
+    with pytest.raises(InvalidCursor):
+        decode_cursor(f"{forged}.{sig}", "s3cret")
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "other")
@@ -0,0 +1,52 @@
+import io
+from newssearch.providers.feed import FeedIngestor, FeedProvider, FeedStore, parse_feed
+from newssearch.providers.registry import build_providers
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Example Wire</title>
+<item><title>Apple ships new chip</title><link>https://example.com/apple-chip</link>
+<description>&lt;p&gt;Apple silicon&lt;/p&gt;</description><pubDate>Fri, 08 Aug 2025 10:00:00 GMT</pubDate></item>
+<item><title>Weather report</title><link>https://example.com/weather</link>
+<description>Rain</description><pubDate>Fri, 08 Aug 2025 11:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom Daily</title>
+<entry><title>Apple earnings</title><link rel="alternate" href="https://atom.example/apple"/>
+<summary>Quarterly results</summary><published>2025-08-08T12:00:00Z</published></entry>
+</feed>"""
+
+class FakeResp(io.BytesIO):
+    def __enter__(self): return self
+    def __exit__(self, *a): return False
+
+def test_parse_rss_and_atom():
+    rss = parse_feed(RSS)
+    assert rss[0]["website"] == "Example Wire"
+    assert rss[0]["description"] == "Apple silicon"
+    assert rss[0]["published_at"] == "2025-08-08T10:00:00+00:00"
+    atom = parse_feed(ATOM)
+    assert atom[0]["url"] == "https://atom.example/apple"
+
+def test_ingest_then_search_is_local():
+    feeds = {"http://f/rss": RSS, "http://f/atom": ATOM}
+    store = FeedStore()
+    ingestor = FeedIngestor(store, list(feeds), opener=lambda url, timeout: FakeResp(feeds[url]))
+    assert ingestor.ingest_once() == 3
+    assert ingestor.ingest_once() == 0  # re-ingest dedupes by canonical URL
+
+    out = FeedProvider(store).fetch("apple", page=1, page_size=10, offline=False)
+    assert out["total"] == 2
+    assert [it["url"] for it in out["items"]] == ["https://atom.example/apple", "https://example.com/apple-chip"]
+
+def test_registry_skips_unknown_names():
+    providers = build_providers(["guardian", "nope", "nyt"])
+    assert [p.name for p in providers] == ["guardian", "nyt"]
+
+def test_parse_feed_rejects_entity_expansion():
+    import pytest
+    from defusedxml import EntitiesForbidden
+    bomb = b"""<?xml version="1.0"?><!DOCTYPE rss [<!ENTITY a "aaaa"><!ENTITY b "&a;&a;&a;">]>
+<rss version="2.0"><channel><title>&b;</title></channel></rss>"""
+    with pytest.raises(EntitiesForbidden):
+        parse_feed(bomb)
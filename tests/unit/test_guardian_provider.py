@@ -17,3 +17,26 @@ def test_guardian_egress_denied_falls_back_offline(monkeypatch, offline_files, t
     out = gp.fetch("apple", 1, 10, offline=False)
     assert isinstance(out, dict)
     assert "items" in out
+
+def test_egress_denial_costs_one_token_and_no_breaker_failure(monkeypatch, offline_files):
+    from newssearch.utils.circuit_breaker import CircuitBreaker
+    def bad_open(url, timeout=6): raise AssertionError("Should not call upstream")
+    monkeypatch.setattr("urllib.request.urlopen", bad_open)
+    lim = DummyLimiter(allow_n=0)
+    breaker = CircuitBreaker(fail_max=3, reset_timeout=60)
+    gp = GuardianProvider(api_key="k", breaker=breaker, egress_limiter=lim)
+    out = gp.fetch("apple", 1, 10, offline=False)
+    assert out["degraded"] is True
+    assert lim.n == -1
+    assert breaker.fail_counter == 0
+
+def test_client_errors_are_not_retried(monkeypatch, offline_files):
+    import io, urllib.error
+    calls = {"n": 0}
+    def forbidden(url, timeout=6):
+        calls["n"] += 1
+        raise urllib.error.HTTPError(url, 403, "Forbidden", {}, io.BytesIO(b""))
+    monkeypatch.setattr("urllib.request.urlopen", forbidden)
+    gp = GuardianProvider(api_key="k")
+    gp.fetch("apple", 1, 10, offline=False)
+    assert calls["n"] == 1
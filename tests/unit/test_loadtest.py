@@ -0,0 +1,30 @@
+from benchmarks.loadtest import append_history, compare, load_history, rolling_baseline
+
+def _run(p50, p99, rps, non_200=0, requests=100):
+    return {"requests": requests, "p50_ms": p50, "p99_ms": p99, "rps": rps, "non_200": non_200}
+
+def test_rolling_baseline_is_the_median_of_the_last_window_runs():
+    runs = [{"warm": _run(100, 900, 1)}] + [{"warm": _run(p, p * 10, 500 - p)} for p in (10, 30, 20)]
+    runs.append({"cold": _run(50, 80, 40)})
+    base = rolling_baseline(runs, window=3)
+    assert base["warm"] == {"p50_ms": 20, "p99_ms": 200, "rps": 480, "runs": 3}
+    assert base["cold"]["runs"] == 1
+
+def test_compare_flags_regressions_beyond_tolerance_only():
+    base = {"warm": {"p50_ms": 10, "p99_ms": 100, "rps": 1000}}
+    assert compare({"warm": _run(12, 120, 800)}, base, 0.25) == []
+    failures = compare({"warm": _run(13, 130, 700)}, base, 0.25)
+    assert [f.split(":")[1].split()[0] for f in failures] == ["p50_ms", "p99_ms", "rps"]
+    assert compare({"new": _run(999, 999, 1)}, base, 0.25) == []  # no baseline yet
+
+def test_compare_fails_non_200_runs_even_when_faster():
+    base = {"warm": {"p50_ms": 10, "p99_ms": 100, "rps": 1000}}
+    failures = compare({"warm": _run(1, 2, 50000, non_200=100), "cold": _run(1, 2, 3, non_200=1)}, base, 0.25)
+    assert failures == ["warm: 100 of 100 responses were not 200", "cold: 1 of 100 responses were not 200"]
+
+def test_history_is_filtered_by_host(tmp_path):
+    path = tmp_path / "history.jsonl"
+    append_history(path, "a", {"warm": _run(1, 2, 3)})
+    append_history(path, "b", {"warm": _run(4, 5, 6)})
+    assert load_history(path, "b") == [{"warm": _run(4, 5, 6)}]
+    assert load_history(tmp_path / "missing.jsonl", "a") == []
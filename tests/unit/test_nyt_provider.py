@@ -21,3 +21,12 @@ def test_nyt_retry_then_success(monkeypatch, tmp_path, offline_files):
     out = np.fetch("apple", page=1, page_size=10, offline=False)
     assert attempts["n"] == 3
     assert "items" in out
+
+def test_offline_fixture_is_paged(offline_files):
+    docs = [{"web_url": f"https://n/{i}", "pub_date": f"2025-08-08T{i:02d}:00:00+0000"} for i in range(5)]
+    (offline_files / "data" / "nyt_offline.json").write_text(json.dumps({"response": {"docs": docs, "meta": {"hits": 99}}}))
+    np = NYTProvider(api_key=None)
+    pages = [np.fetch("apple", page=p, page_size=2, offline=True) for p in (1, 2, 3, 4)]
+    assert [[it.url for it in out["items"]] for out in pages] == \
+        [["https://n/0", "https://n/1"], ["https://n/2", "https://n/3"], ["https://n/4"], []]
+    assert all(out["total"] == 5 for out in pages)
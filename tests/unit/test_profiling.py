@@ -0,0 +1,38 @@
+import threading
+import time
+import pytest
+from newssearch.utils import profiling
+
+def _busy_worker(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_sample_stacks_sees_other_threads_and_collapses():
+    stop = threading.Event()
+    t = threading.Thread(target=_busy_worker, args=(stop,), name="busy")
+    t.start()
+    try:
+        counts = profiling.sample_stacks(0.2, hz=200)
+    finally:
+        stop.set(); t.join()
+    busy = [s for s in counts if s.startswith("busy;")]
+    assert busy and all("test_profiling:_busy_worker" in s for s in busy)
+    assert "test_profiling:test_sample_stacks" not in " ".join(counts)  # caller excluded
+    line = profiling.render_collapsed(counts).splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+def test_one_profile_at_a_time():
+    t = threading.Thread(target=profiling.sample_stacks, args=(0.3,))
+    t.start()
+    time.sleep(0.05)
+    try:
+        with pytest.raises(profiling.ProfilerBusy):
+            profiling.sample_stacks(0.1)
+    finally:
+        t.join()
+
+def test_top_allocations_traces_only_for_the_window():
+    import tracemalloc
+    out = profiling.top_allocations(0.05, limit=3)
+    assert not tracemalloc.is_tracing()
+    assert len(out["top"]) <= 3 and out["window_seconds"] == 0.05
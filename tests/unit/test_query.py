@@ -0,0 +1,24 @@
+from newssearch.utils.query import DEFAULT_STOPWORDS, QueryCanonicalizer, canonicalize
+
+def test_case_whitespace_and_order_collapse():
+    assert canonicalize("Climate Change") == canonicalize("climate  change") == canonicalize(" change climate ")
+    assert canonicalize("apple apple") == "apple"
+
+def test_operator_queries_keep_order_and_case():
+    assert canonicalize("Apple OR  Google") == "apple OR google"
+    assert canonicalize("google OR apple") == "google OR apple"
+
+def test_optional_stemming_and_stopwords():
+    c = QueryCanonicalizer(stem=True, stopwords=DEFAULT_STOPWORDS)
+    assert c("the Elections in Cities") == c("city election")
+    assert c("the") == "the"  # never reduce a query to nothing
+
+def test_stemming_leaves_non_plurals_alone():
+    c = QueryCanonicalizer(stem=True)
+    assert c("news species series") == "news series species"
+    assert c("elections") == "election"
+
+def test_upstream_keeps_every_term():
+    c = QueryCanonicalizer(stem=True, stopwords=DEFAULT_STOPWORDS)
+    assert c.upstream("The Elections  in Cities") == "cities elections in the"
+    assert c("The Elections in Cities") == "city election"
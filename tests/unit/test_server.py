@@ -1,3 +1,4 @@
+import json
 import requests
 from tests.conftest import run_server
 
@@ -20,3 +21,108 @@ def test_search_ok_with_auth_offline():
         body = r.json()
         assert "items" in body
         assert "time_taken_ms" in body
+
+def test_search_sort_param():
+    with run_server(port=8087) as (_, base):
+        h = {"Authorization": "Bearer test-secret"}
+        r = requests.get(f"{base}/search?query=apple&sort=relevance", headers=h)
+        assert r.status_code == 200
+        assert r.json()["sort"] == "relevance"
+        assert requests.get(f"{base}/search?query=apple&sort=bogus", headers=h).status_code == 400
+
+def test_search_cursor_pagination():
+    with run_server(port=8088) as (_, base):
+        h = {"Authorization": "Bearer test-secret"}
+        first = requests.get(f"{base}/search?query=apple&page_size=2", headers=h).json()
+        assert first["page"] == 1 and len(first["items"]) == 2
+        assert first["next_cursor"]  # the offline fixtures hold four articles
+        assert first["links"]["next"].endswith(f"cursor={first['next_cursor']}")
+        r = requests.get(f"{base}/search?query=apple&page_size=2&cursor={first['next_cursor']}", headers=h)
+        assert r.status_code == 200 and r.json()["page"] == 2
+        second = [it["url"] for it in r.json()["items"]]
+        assert second and not set(second) & {it["url"] for it in first["items"]}
+        bad = requests.get(f"{base}/search?query=apple&page_size=3&cursor={first['next_cursor']}", headers=h)
+        assert bad.status_code == 400
+        assert requests.get(f"{base}/search?query=apple&cursor=x.y", headers=h).status_code == 400
+        # the client-held API key must not be able to mint cursors
+        from newssearch.utils.cursor import encode_cursor
+        forged = encode_cursor({"q": "apple", "ps": 2, "off": True, "n": 2, "pos": {}}, "test-secret")
+        assert requests.get(f"{base}/search?query=apple&page_size=2&cursor={forged}", headers=h).status_code == 400
+
+def test_search_batch():
+    with run_server(port=8089) as (_, base):
+        h = {"Authorization": "Bearer test-secret"}
+        body = {"queries": [{"query": "apple"}, {"query": "bad!"}, {"query": "apple", "sort": "relevance"}]}
+        r = requests.post(f"{base}/search/batch", json=body, headers=h)
+        assert r.status_code == 200
+        results = r.json()["results"]
+        assert [e["index"] for e in results] == [0, 1, 2]
+        assert results[1]["error"] == "invalid_query"
+        assert results[2]["sort"] == "relevance" and "items" in results[2]
+
+        nulls = {"queries": [{"query": "apple", "page": None, "sort": None, "offline": None}]}
+        r = requests.post(f"{base}/search/batch", json=nulls, headers=h)
+        assert r.json()["results"][0]["sort"] == "date" and "items" in r.json()["results"][0]
+
+        r = requests.post(f"{base}/search/batch", json={**body, "stream": True}, headers=h)
+        lines = [json.loads(l) for l in r.text.splitlines()]
+        assert sorted(e["index"] for e in lines) == [0, 1, 2]
+        assert requests.post(f"{base}/search/batch", json={"queries": []}, headers=h).status_code == 400
+        assert requests.post(f"{base}/search/batch", json=body).status_code == 401
+
+def test_debug_endpoints_are_off_by_default():
+    with run_server(port=8092) as (_, base):
+        h = {"Authorization": "Bearer test-secret"}
+        assert requests.get(f"{base}/debug/threads", headers=h).status_code == 404
+
+def test_debug_endpoints(monkeypatch):
+    monkeypatch.setenv("DEBUG_ENDPOINTS", "1")
+    monkeypatch.setenv("DEBUG_TOKEN", "debug-token")
+    with run_server(port=8090) as (_, base):
+        h = {"Authorization": "Bearer debug-token"}
+        assert requests.get(f"{base}/debug/threads").status_code == 401
+        assert requests.get(f"{base}/debug/threads", headers={"Authorization": "Bearer test-secret"}).status_code == 401
+        assert requests.get(f"{base}/debug/threads?seconds=x", headers=h).status_code == 200
+        assert requests.get(f"{base}/debug/profile?seconds=x", headers=h).status_code == 400
+        threads = requests.get(f"{base}/debug/threads", headers=h).json()["threads"]
+        assert any(t["name"] == "MainThread" for t in threads)
+        r = requests.get(f"{base}/debug/profile?seconds=0.2&hz=200", headers=h)
+        assert r.status_code == 200 and r.headers["Content-Type"].startswith("text/plain")
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in r.text.splitlines())
+        alloc = requests.get(f"{base}/debug/alloc?seconds=0.1&limit=5", headers=h).json()
+        assert len(alloc["top"]) <= 5
+
+def test_suggest_from_request_stream():
+    with run_server(port=8091) as (_, base):
+        h = {"Authorization": "Bearer test-secret"}
+        assert requests.get(f"{base}/search?query=Apple Watch", headers=h).status_code == 200
+        r = requests.get(f"{base}/suggest?prefix=app", headers=h)
+        assert r.status_code == 200
+        top = r.json()["suggestions"][0]
+        assert top["query"] == "apple watch" and top["cached"] is True
+        assert requests.get(f"{base}/suggest?prefix=", headers=h).status_code == 400
+        assert requests.get(f"{base}/suggest?prefix=app").status_code == 401
+
+def test_suggest_recording_failure_does_not_touch_the_response(monkeypatch):
+    with run_server(port=8093) as (_, base):
+        import newssearch.app as app
+        def boom(*a, **k): raise RuntimeError("index broken")
+        monkeypatch.setattr(app.SUGGEST, "record_query", boom)
+        h = {"Authorization": "Bearer test-secret"}
+        r = requests.get(f"{base}/search?query=apple", headers=h)
+        assert r.status_code == 200 and "offline" not in r.json()
+        r = requests.post(f"{base}/search/batch", json={"queries": [{"query": "apple"}]}, headers=h)
+        assert r.status_code == 200 and "items" in r.json()["results"][0]
+
+def test_saturated_redis_pool_is_503_not_429(monkeypatch):
+    import redis
+    with run_server(port=8094) as (_, base):
+        import newssearch.app as app
+        class Saturated:
+            def pipeline(self, *a, **k): raise redis.exceptions.MaxConnectionsError("no pooled connection free")
+        monkeypatch.setattr(app.CACHE, "_client", Saturated())
+        h = {"Authorization": "Bearer test-secret"}
+        for r in (requests.get(f"{base}/search?query=apple", headers=h),
+                  requests.post(f"{base}/search/batch", json={"queries": [{"query": "apple"}]}, headers=h)):
+            assert r.status_code == 503
+            assert r.json() == {"error": "cache_unavailable"} and r.headers["Retry-After"] == "1"
@@ -0,0 +1,112 @@
+import fakeredis
+import pytest
+import redis
+from collections import Counter
+from newssearch.utils.cache import BackgroundWriter, RedisCache
+from newssearch.utils.rate_limit import RateLimiter
+from newssearch.utils.sharding import HashRing, ShardedRedis
+
+def _cluster(n=3, replicas=2):
+    servers = {f"node{i}:6379/0": fakeredis.FakeServer() for i in range(n)}
+    clients = {name: fakeredis.FakeStrictRedis(server=s, decode_responses=True) for name, s in servers.items()}
+    return servers, clients, ShardedRedis(clients, replicas=replicas, check_interval=3600)
+
+def test_ring_spreads_keys_and_removal_only_moves_the_removed_nodes_keys():
+    ring = HashRing(["a", "b", "c"])
+    keys = [f"agg:q{i}" for i in range(3000)]
+    before = {k: ring.nodes_for(k)[0] for k in keys}
+    assert min(Counter(before.values()).values()) > 700
+    ring.remove("b")
+    after = {k: ring.nodes_for(k)[0] for k in keys}
+    assert all(after[k] == before[k] for k in keys if before[k] != "b")
+    assert sorted(ring.nodes_for("agg:q1", 5)) == ["a", "c"]
+
+def test_cache_keys_are_replicated_and_mget_spans_nodes():
+    _, clients, r = _cluster()
+    cache = RedisCache("localhost", 6379, 0, client=r)
+    for i in range(20):
+        cache.set_json(f"agg:{i}", {"i": i}, 60)
+    holders = [sum(c.exists(f"agg:{i}") for c in clients.values()) for i in range(20)]
+    assert holders == [2] * 20
+    assert cache.get_many_json([f"agg:{i}" for i in range(20)] + ["agg:none"]) == [{"i": i} for i in range(20)] + [None]
+
+def test_background_writer_pipelines_through_router():
+    _, _, r = _cluster()
+    writer = BackgroundWriter(r, max_queue=100)
+    cache = RedisCache("localhost", 6379, 0, client=r, writer=writer)
+    for i in range(10):
+        cache.set_json(f"prov:{i}", {"i": i}, 60)
+    writer.flush()
+    assert cache.get_json("prov:7") == {"i": 7}
+
+def test_rate_limit_counter_lives_on_one_node_and_stays_exact():
+    _, clients, r = _cluster()
+    limiter = RateLimiter(r, "ingress", rate=3, per_seconds=60)
+    assert [limiter.allow("user") for _ in range(4)] == [True, True, True, False]
+    counts = [c.get("rl:ingress:user") for c in clients.values()]
+    assert [c for c in counts if c] == ["4"]
+    owner = next(c for c in clients.values() if c.get("rl:ingress:user"))
+    assert 0 < owner.ttl("rl:ingress:user") <= 60
+
+def test_down_node_is_dropped_reads_fall_back_to_replica_and_it_comes_back():
+    servers, clients, r = _cluster()
+    cache = RedisCache("localhost", 6379, 0, client=r)
+    cache.set_json("agg:apple", {"ok": 1}, 60)
+    primary = r._ring.nodes_for("agg:apple")[0]
+    servers[primary].connected = False
+
+    for _ in range(5):  # whichever replica the read picks, it answers
+        assert cache.get_json("agg:apple") == {"ok": 1}
+    limiter = RateLimiter(r, "ingress", rate=5, per_seconds=60)
+    for i in range(10):
+        limiter.allow(f"user{i}")
+    assert primary not in r.healthy_nodes and len(r.healthy_nodes) == 2
+
+    servers[primary].connected = True
+    assert r.revive() == [primary]
+    assert primary in r.healthy_nodes
+
+def test_all_nodes_down_fails_open_through_cache():
+    servers, _, r = _cluster(n=2)
+    cache = RedisCache("localhost", 6379, 0, client=r)
+    for s in servers.values():
+        s.connected = False
+    assert cache.get_json("agg:x") is None
+    with pytest.raises(redis.exceptions.ConnectionError):
+        r.get("agg:x")
+
+def test_redis_client_builds_router_for_several_nodes():
+    from newssearch.utils.redis_client import parse_node, redis_client
+    assert parse_node("10.0.0.5:6380/2") == ("10.0.0.5", 6380, 2)
+    assert parse_node("cache-a", default_db=1) == ("cache-a", 6379, 1)
+    assert isinstance(redis_client("localhost", 6379, 0, ["a:6379", "b:6379"]), ShardedRedis)
+    assert not isinstance(redis_client("localhost", 6379, 0, ["a:6379"]), ShardedRedis)
+
+def _failing(client, exc):
+    real = client.pipeline
+    def pipeline(*a, **k):
+        p = real(*a, **k)
+        def execute(*_a, **_k): raise exc
+        p.execute = execute
+        return p
+    client.pipeline = pipeline
+
+def test_one_timeout_does_not_drop_a_node_that_still_answers_ping():
+    _, clients, r = _cluster()
+    owner = r._ring.nodes_for("rl:ingress:user")[0]
+    _failing(clients[owner], redis.exceptions.TimeoutError("slow reply"))
+    for _ in range(2):
+        with pytest.raises(redis.exceptions.TimeoutError):
+            r.incr("rl:ingress:user")
+        assert owner in r.healthy_nodes
+    assert r.incr("rl:ingress:user") == 1  # third consecutive failure drops it; the retry lands elsewhere
+    assert owner not in r.healthy_nodes
+
+def test_pool_exhaustion_is_backpressure_not_a_node_failure():
+    _, clients, r = _cluster()
+    owner = r._ring.nodes_for("rl:ingress:user")[0]
+    _failing(clients[owner], redis.exceptions.MaxConnectionsError("pool exhausted"))
+    for _ in range(5):
+        with pytest.raises(redis.exceptions.MaxConnectionsError):
+            r.incr("rl:ingress:user")
+    assert owner in r.healthy_nodes
@@ -1,4 +1,4 @@
-from newssearch.utils.strategies import CanonUrlDedupe, PublishedAtSort
+from newssearch.utils.strategies import CanonUrlDedupe, PublishedAtSort, HeapMergeSort, RelevanceSort
 
 def test_dedupe_by_canon():
     items = [
@@ -13,3 +13,41 @@ def test_sort_by_published_at():
     items = [{"published_at": "2024-01-01"}, {"published_at": "2025-01-01"}]
     out = PublishedAtSort(desc=True).sort(items)
     assert out[0]["published_at"] == "2025-01-01"
+
+def test_heap_merge_mixed_tz_dedupes_and_stops_at_limit():
+    guardian = [
+        {"url": "https://www.theguardian.com/c", "published_at": "2025-08-08T12:00:00Z"},
+        {"url": "https://example.com/shared", "published_at": "2025-08-08T10:00:00Z"},
+    ]
+    nyt = [
+        {"url": "https://www.nytimes.com/b", "published_at": "2025-08-08T11:30:00+0000"},
+        {"url": "http://EXAMPLE.com/shared/", "published_at": "2025-08-08T10:00:00+0000"},
+        {"url": "https://www.nytimes.com/a", "published_at": "2025-08-07T09:00:00+0000"},
+    ]
+    merger = HeapMergeSort(desc=True)
+    out = merger.merge([guardian, nyt], CanonUrlDedupe(), limit=3)
+    assert [it["url"] for it in out] == [
+        "https://www.theguardian.com/c",
+        "https://www.nytimes.com/b",
+        "https://example.com/shared",
+    ]
+
+def test_heap_merge_sorts_unordered_stream():
+    stream = [{"url": "u1", "published_at": "2024-01-01"}, {"url": "u2", "published_at": "2025-01-01T00:00:00Z"}]
+    out = HeapMergeSort(desc=True).merge([stream], CanonUrlDedupe(), limit=10)
+    assert out[0]["url"] == "u2"
+
+def test_relevance_prefers_title_match_over_recency():
+    from datetime import datetime, timezone
+    now = datetime(2025, 8, 8, 12, tzinfo=timezone.utc)
+    items = [
+        {"url": "a", "title": "Markets today", "description": "", "published_at": "2025-08-08T12:00:00Z"},
+        {"url": "b", "title": "Apple earnings beat", "description": "apple", "published_at": "2025-08-06T12:00:00+0000"},
+    ]
+    out = RelevanceSort(now_fn=lambda: now).rank(items, "apple")
+    assert out[0]["url"] == "b"
+
+def test_relevance_source_weight_breaks_ties():
+    items = [{"url": "a", "title": "x", "source": "guardian"}, {"url": "b", "title": "x", "source": "nytimes"}]
+    out = RelevanceSort(source_weights={"nytimes": 2.0}).rank(items, "x")
+    assert out[0]["url"] == "b"
@@ -0,0 +1,76 @@
+from newssearch.utils.suggest import SuggestIndex
+
+class Clock:
+    def __init__(self): self.t = 1_000_000.0
+    def __call__(self): return self.t
+
+def test_ranked_by_frequency_and_prefix_only():
+    idx = SuggestIndex(now_fn=Clock(), cache_ttl=0)
+    for q in ["apple", "apple", "apple watch", "Apple  Watch", "apple watch", "banana"]:
+        idx.record_query(q)
+    assert [p for p, _, _ in idx.suggest("APP")] == ["apple watch", "apple"]
+    assert idx.suggest("ban")[0][0] == "banana"
+    assert idx.suggest("x") == [] and idx.suggest(" ") == []
+
+def test_frequencies_decay_so_recent_queries_win():
+    clock = Clock()
+    idx = SuggestIndex(half_life_seconds=3600, now_fn=clock, cache_ttl=0)
+    for _ in range(4):
+        idx.record_query("election results")
+    clock.t += 3 * 3600          # old hits are worth 4 * 1/8 now
+    idx.record_query("election day")
+    top = idx.suggest("elec")
+    assert [p for p, _, _ in top] == ["election day", "election results"]
+    assert abs(top[1][1] - 0.5) < 1e-6
+
+def test_recently_searched_queries_are_flagged_cached_and_boosted():
+    clock = Clock()
+    idx = SuggestIndex(now_fn=clock, cache_ttl=300, title_weight=0.75)
+    idx.record_titles(["Climate summit opens", "Climate talks stall"])  # "climate" 2 x 0.75
+    idx.record_query("climate change")
+    top = idx.suggest("clim")
+    assert top[0][0] == "climate change" and top[0][2] is True
+    assert dict((p, c) for p, _, c in top)["climate"] is False
+    clock.t += 301
+    assert idx.suggest("clim")[0][0] == "climate"
+
+def test_incremental_merge_and_trim_to_max_phrases():
+    clock = Clock()
+    idx = SuggestIndex(now_fn=clock, max_phrases=50, merge_every=16, cache_ttl=0)
+    for i in range(200):
+        clock.t += 1
+        idx.record_query(f"topic {i:03d}")
+    idx.record_query("topic 150")
+    idx.flush()
+    assert len(idx) <= 50
+    assert idx.suggest("topic 0") == []  # oldest phrases were trimmed first
+    assert idx.suggest("topic 15", limit=1)[0][0] == "topic 150"
+    assert all(p.startswith("topic 1") for p, _, _ in idx.suggest("topic 1", limit=20))
+
+def test_long_idle_gaps_rescale_instead_of_overflowing():
+    clock = Clock()
+    idx = SuggestIndex(half_life_seconds=1, now_fn=clock, cache_ttl=300)
+    idx.record_query("apple")
+    for _ in range(3):
+        clock.t += 2000            # 2**2000 would overflow a float
+        idx.record_query("apple")  # existing phrase: no merge runs
+    assert idx.suggest("app")[0][0] == "apple"
+    assert idx.suggest("app")[0][1] > 0
+
+def test_searched_entries_are_pruned_with_the_scores():
+    clock = Clock()
+    idx = SuggestIndex(half_life_seconds=1, now_fn=clock, cache_ttl=10)
+    for i in range(50):
+        idx.record_query(f"query {i}")
+    clock.t += 100
+    idx.record_query("fresh")
+    assert len(idx._searched) == 1
+
+def test_cached_flag_follows_the_canonical_cache_key():
+    from newssearch.utils.query import QueryCanonicalizer
+    idx = SuggestIndex(now_fn=Clock(), cache_ttl=300, canonicalize=QueryCanonicalizer())
+    idx.record_query("Watch Apple")
+    idx.record_titles(["New apple watch unveiled"])  # bigram "apple watch" shares the key
+    found = dict((p, cached) for p, _, cached in idx.suggest("apple"))
+    assert found["apple watch"] is True
+    assert found["apple"] is False
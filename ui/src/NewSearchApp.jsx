@@ -38,6 +38,23 @@ export default function NewsSearchApp() {
   const debouncedQuery = useDebounced(query, 500);
   const controllerRef = useRef(null);
 
+  // type-ahead: /suggest is served from memory, so it can follow keystrokes closely
+  const [suggestions, setSuggestions] = useState([]);
+  const suggestPrefix = useDebounced(query, 120);
+  useEffect(() => {
+    const prefix = suggestPrefix.trim();
+    if (!prefix) return setSuggestions([]);
+    const controller = new AbortController();
+    fetch(buildUrl(API_BASE, "/suggest", { prefix }), {
+      signal: controller.signal,
+      headers: { "Authorization": `Bearer ${API_SECRET_KEY}` }
+    })
+      .then((res) => (res.ok ? res.json() : { suggestions: [] }))
+      .then((json) => setSuggestions(json.suggestions || []))
+      .catch(() => {});
+    return () => controller.abort();
+  }, [suggestPrefix]);
+
   const totalPages = data?.total_estimated_pages || 0;
   const canPrev = page > 1;
   const canNext = totalPages ? page < totalPages : true;
@@ -110,8 +127,15 @@ export default function NewsSearchApp() {
               value={query}
               onChange={(e) => setQuery(e.target.value)}
               placeholder="e.g. apple, cricket, bitcoin"
+              list="query-suggestions"
+              autoComplete="off"
               style={{ width: "100%", padding: "8px 10px", borderRadius: 10, border: "1px solid #ddd" }}
             />
+            <datalist id="query-suggestions">
+              {suggestions.map((s) => (
+                <option key={s.query} value={s.query}>{s.cached ? "recent" : ""}</option>
+              ))}
+            </datalist>
           </div>
           <div>
             <label style={{ fontSize: 12, color: "#333" }}>City (optional)</label>